@@ -9,24 +9,63 @@ AI技术资讯实时抓取器
 5. Google AI Blog
 """
 
+import asyncio
+import hashlib
+import io
 import json
+import pickle
+import sqlite3
 import ssl
+import threading
+import time
 import urllib.request
 import urllib.error
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 from typing import List, Dict, Optional
 from xml.etree import ElementTree as ET
-import feedparser
-import subprocess
-import sys
 
 # 尝试导入requests，如果不存在则使用urllib
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     HAS_REQUESTS = True
 except ImportError:
     HAS_REQUESTS = False
 
+# 尝试导入aiohttp，支持并发抓取；不存在则退回顺序抓取
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# 尝试导入orjson（C实现的JSON序列化，直接输出bytes），不存在则用标准库json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# API端点模板（查询参数统一经urlencode编码）
+ARXIV_SEARCH_URL = 'https://export.arxiv.org/api/query?{}'
+HN_SEARCH_URL = 'https://hn.algolia.com/api/v1/search_by_date?{}'
+GITHUB_SEARCH_URL = 'https://api.github.com/search/repositories?{}'
+
+# Atom命名空间标签常量（避免在解析热循环中重复拼接字符串）
+ATOM = '{http://www.w3.org/2005/Atom}'
+ATOM_ENTRY = ATOM + 'entry'
+ATOM_TITLE = ATOM + 'title'
+ATOM_ID = ATOM + 'id'
+ATOM_PUBLISHED = ATOM + 'published'
+ATOM_SUMMARY = ATOM + 'summary'
+ATOM_AUTHOR_NAME = ATOM + 'author/' + ATOM + 'name'
+ATOM_CATEGORY = ATOM + 'category'
+
 
 class AINewsFetcher:
     """AI新闻获取器"""
@@ -36,56 +75,233 @@ class AINewsFetcher:
         self.yesterday = self.current_date - timedelta(days=1)
         self.two_days_ago = self.current_date - timedelta(days=2)
         self.one_week_ago = self.current_date - timedelta(days=7)
+        self._week_ago_str = self.one_week_ago.strftime('%Y-%m-%d')
+
+        # 日志时间前缀缓存（按秒复用）
+        self._last_log_second = 0
+        self._last_log_prefix = ''
 
         # SSL上下文（处理证书问题）
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
 
+        # 复用同一个Session，连接池+keep-alive避免每次请求重建TCP/TLS连接
+        self._session = None
+        if HAS_REQUESTS:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(
+                max_retries=Retry(total=3, backoff_factor=0.5,
+                                  status_forcelist=[502, 503, 504]),
+                pool_connections=4,
+                pool_maxsize=10
+            )
+            self._session.mount('https://', adapter)
+            self._session.headers.update({
+                'User-Agent': 'AI-News-Fetcher/1.0',
+                'Accept-Encoding': 'gzip, deflate'
+            })
+
+        # 条件GET缓存（ETag / Last-Modified）
+        # Feed未变化时服务器返回304，直接复用上次解析结果
+        self.cache_dir = Path.home() / '.cache' / 'ai_news'
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass
+        self._etag_file = self.cache_dir / 'etags.json'
+        try:
+            with open(self._etag_file, 'r', encoding='utf-8') as f:
+                self._etag_cache = json.load(f)
+        except (OSError, ValueError):
+            self._etag_cache = {}
+
+        # 增量缓存：记录各来源已见过的条目ID，跨运行识别新内容
+        try:
+            self._seen_db = sqlite3.connect(str(self.cache_dir / 'seen.db'))
+            self._seen_db.execute(
+                "CREATE TABLE IF NOT EXISTS seen ("
+                "source TEXT, id TEXT, first_seen TIMESTAMP, "
+                "PRIMARY KEY(source, id))"
+            )
+            self._seen_db.commit()
+        except sqlite3.Error:
+            self._seen_db = None
+
+    def _mark_new_items(self, source: str, items: List[Dict], id_field: str) -> List[Dict]:
+        """给条目打is_new标记：首次见到的ID写入seen.db并标记为新"""
+        if self._seen_db is None:
+            return items
+
+        first_seen = datetime.now().isoformat()
+        cursor = self._seen_db.cursor()
+        for item in items:
+            item_id = item.get(id_field, '')
+            cursor.execute("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)",
+                           (source, item_id, first_seen))
+            item['is_new'] = cursor.rowcount > 0
+        self._seen_db.commit()
+
+        return items
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """释放HTTP连接和缓存数据库"""
+        if self._session is not None:
+            self._session.close()
+        if self._seen_db is not None:
+            self._seen_db.close()
+
+    def _conditional_headers(self, url: str) -> Dict:
+        """根据缓存的ETag/Last-Modified构造条件请求头"""
+        headers = {}
+        entry = self._etag_cache.get(url)
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _load_cached_result(self, url: str) -> Optional[List[Dict]]:
+        """服务器返回304时，读取上次缓存的解析结果"""
+        entry = self._etag_cache.get(url)
+        if not entry or not entry.get('payload_path'):
+            return None
+        try:
+            with open(entry['payload_path'], 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError):
+            return None
+
+    def _store_cached_result(self, url: str, etag: Optional[str],
+                             last_modified: Optional[str], result: List[Dict]):
+        """缓存响应头与解析结果，供下次条件请求使用"""
+        if not etag and not last_modified:
+            return
+        payload_path = self.cache_dir / (hashlib.md5(url.encode()).hexdigest() + '.pkl')
+        try:
+            with open(payload_path, 'wb') as f:
+                pickle.dump(result, f)
+        except OSError:
+            return
+        self._etag_cache[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'payload_path': str(payload_path)
+        }
+        try:
+            with open(self._etag_file, 'w', encoding='utf-8') as f:
+                json.dump(self._etag_cache, f, ensure_ascii=False, indent=2)
+        except OSError:
+            pass
+
+    _log_lock = threading.Lock()
+
     def log(self, msg: str):
-        """日志输出"""
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {msg}")
+        """日志输出（加锁避免多线程抓取时输出交错）"""
+        with self._log_lock:
+            # 同一秒内的连续日志复用已格式化的时间前缀
+            sec = int(time.time())
+            if sec != self._last_log_second:
+                self._last_log_second = sec
+                self._last_log_prefix = time.strftime(
+                    '[%Y-%m-%d %H:%M:%S] ', time.localtime(sec))
+            print(self._last_log_prefix + msg)
+
+    def _arxiv_url(self, max_papers: int) -> str:
+        """构造ArXiv查询URL"""
+        return ARXIV_SEARCH_URL.format(urlencode({
+            'search_query': 'cat:cs.AI OR cat:cs.LG OR cat:cs.CL OR cat:cs.NE '
+                            'OR cat:cs.CV OR cat:cs.RO OR cat:cs.IR',
+            'start': 0,
+            'max_results': max_papers,
+            'sortBy': 'submittedDate',
+            'sortOrder': 'descending'
+        }))
+
+    def _parse_arxiv(self, content: str) -> List[Dict]:
+        """解析ArXiv Atom响应（iterparse单遍流式解析，不保留整棵DOM）"""
+        papers = []
+
+        for event, entry in ET.iterparse(io.StringIO(content), events=('end',)):
+            if entry.tag != ATOM_ENTRY:
+                continue
+
+            paper = {
+                'title': entry.find(ATOM_TITLE).text.strip().replace('\n', ' '),
+                'url': entry.find(ATOM_ID).text.strip(),
+                'published': entry.find(ATOM_PUBLISHED).text.strip(),
+                'summary': entry.find(ATOM_SUMMARY).text.strip()[:500],
+                'authors': [n.text for n in entry.iterfind(ATOM_AUTHOR_NAME)][:5],
+                'categories': [c.get('term') for c in entry.findall(ATOM_CATEGORY)],
+                'source': 'ArXiv'
+            }
+            papers.append(paper)
+            # 已提取完毕，立即释放该entry的子树
+            entry.clear()
+
+        return papers
 
     def fetch_arxiv_papers(self, max_papers: int = 15) -> List[Dict]:
         """从ArXiv获取最新AI论文"""
         self.log("📚 正在抓取 ArXiv AI/ML 论文...")
 
         papers = []
-
-        # 查询最新的AI相关论文
-        url = (
-            "https://export.arxiv.org/api/query?"
-            "search_query=cat:cs.AI+OR+cat:cs.LG+OR+cat:cs.CL+OR+cat:cs.NE+OR+cat:cs.CV+OR+cat:cs.RO+OR+cat:cs.IR&"
-            f"start=0&max_results={max_papers}&"
-            "sortBy=submittedDate&sortOrder=descending"
-        )
+        url = self._arxiv_url(max_papers)
 
         try:
             if HAS_REQUESTS:
-                response = requests.get(url, timeout=30)
+                response = self._session.get(url, headers=self._conditional_headers(url), timeout=30)
+                if response.status_code == 304:
+                    cached = self._load_cached_result(url)
+                    if cached is not None:
+                        self.log(f"♻️ ArXiv未更新，使用缓存 ({len(cached)} 篇)")
+                        return cached[:max_papers]
                 response.raise_for_status()
                 content = response.text
+                papers = self._parse_arxiv(content)
+                self._store_cached_result(url, response.headers.get('ETag'),
+                                          response.headers.get('Last-Modified'), papers)
             else:
                 req = urllib.request.Request(url)
                 with urllib.request.urlopen(req, context=self.ssl_context, timeout=30) as resp:
                     content = resp.read().decode('utf-8')
+                papers = self._parse_arxiv(content)
+
+            self.log(f"✅ 获取到 {len(papers)} 篇ArXiv论文")
 
-            # 解析XML
-            root = ET.fromstring(content)
-
-            for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
-                paper = {
-                    'title': entry.find('{http://www.w3.org/2005/Atom}title').text.strip().replace('\n', ' '),
-                    'url': entry.find('{http://www.w3.org/2005/Atom}id').text.strip(),
-                    'published': entry.find('{http://www.w3.org/2005/Atom}published').text.strip(),
-                    'summary': entry.find('{http://www.w3.org/2005/Atom}summary').text.strip()[:500],
-                    'authors': [a.find('{http://www.w3.org/2005/Atom}name').text
-                               for a in entry.findall('{http://www.w3.org/2005/Atom}author')][:5],
-                    'categories': [c.get('term') for c in entry.findall('{http://www.w3.org/2005/Atom}category')],
-                    'source': 'ArXiv'
-                }
-                papers.append(paper)
+        except Exception as e:
+            self.log(f"❌ ArXiv获取失败: {e}")
+
+        return papers[:max_papers]
 
+    async def _fetch_arxiv(self, session: "aiohttp.ClientSession", max_papers: int = 15) -> List[Dict]:
+        """异步抓取ArXiv论文"""
+        self.log("📚 正在抓取 ArXiv AI/ML 论文...")
+
+        papers = []
+        url = self._arxiv_url(max_papers)
+
+        try:
+            async with session.get(url, headers=self._conditional_headers(url)) as resp:
+                if resp.status == 304:
+                    cached = self._load_cached_result(url)
+                    if cached is not None:
+                        self.log(f"♻️ ArXiv未更新，使用缓存 ({len(cached)} 篇)")
+                        return cached[:max_papers]
+                resp.raise_for_status()
+                content = await resp.text()
+                etag = resp.headers.get('ETag')
+                last_modified = resp.headers.get('Last-Modified')
+
+            papers = self._parse_arxiv(content)
+            self._store_cached_result(url, etag, last_modified, papers)
             self.log(f"✅ 获取到 {len(papers)} 篇ArXiv论文")
 
         except Exception as e:
@@ -93,6 +309,32 @@ class AINewsFetcher:
 
         return papers[:max_papers]
 
+    def _hn_url(self, max_items: int) -> str:
+        """构造Hacker News查询URL（tags中的逗号/空格正确转义）"""
+        return HN_SEARCH_URL.format(urlencode([
+            ('tags', 'story'),
+            ('tags', 'AI,Machine Learning,LLM,OpenAI,Claude,GPT,'
+                     'Deep Learning,Artificial Intelligence'),
+            ('hitsPerPage', max_items)
+        ]))
+
+    def _parse_hn(self, data: Dict) -> List[Dict]:
+        """解析Hacker News响应"""
+        items = []
+        for hit in data.get('hits', []):
+            item = {
+                'title': hit.get('title', ''),
+                'url': hit.get('url', f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"),
+                'points': hit.get('points', 0),
+                'author': hit.get('author', ''),
+                'created_at': hit.get('created_at', ''),
+                'num_comments': hit.get('num_comments', 0),
+                'source': 'Hacker News',
+                'object_id': hit.get('objectID', '')
+            }
+            items.append(item)
+        return items
+
     def fetch_hacker_news(self, max_items: int = 20) -> List[Dict]:
         """从Hacker News获取AI相关讨论"""
         self.log("📰 正在抓取 Hacker News AI讨论...")
@@ -101,15 +343,10 @@ class AINewsFetcher:
 
         try:
             # 使用Algolia API获取HN数据
-            url = (
-                "https://hn.algolia.com/api/v1/search_by_date?"
-                "tags=story&"
-                f"tags=AI,Machine Learning,LLM,OpenAI,Claude,GPT,Deep Learning,Artificial Intelligence&"
-                f"hitsPerPage={max_items}"
-            )
+            url = self._hn_url(max_items)
 
             if HAS_REQUESTS:
-                response = requests.get(url, timeout=30)
+                response = self._session.get(url, timeout=30)
                 response.raise_for_status()
                 data = response.json()
             else:
@@ -117,19 +354,26 @@ class AINewsFetcher:
                 with urllib.request.urlopen(req, context=self.ssl_context, timeout=30) as resp:
                     data = json.loads(resp.read().decode('utf-8'))
 
-            for hit in data.get('hits', []):
-                item = {
-                    'title': hit.get('title', ''),
-                    'url': hit.get('url', f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"),
-                    'points': hit.get('points', 0),
-                    'author': hit.get('author', ''),
-                    'created_at': hit.get('created_at', ''),
-                    'num_comments': hit.get('num_comments', 0),
-                    'source': 'Hacker News',
-                    'object_id': hit.get('objectID', '')
-                }
-                items.append(item)
+            items = self._parse_hn(data)
+            self.log(f"✅ 获取到 {len(items)} 条HN讨论")
+
+        except Exception as e:
+            self.log(f"❌ Hacker News获取失败: {e}")
+
+        return items[:max_items]
+
+    async def _fetch_hn(self, session: "aiohttp.ClientSession", max_items: int = 20) -> List[Dict]:
+        """异步抓取Hacker News讨论"""
+        self.log("📰 正在抓取 Hacker News AI讨论...")
 
+        items = []
+
+        try:
+            async with session.get(self._hn_url(max_items)) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+
+            items = self._parse_hn(data)
             self.log(f"✅ 获取到 {len(items)} 条HN讨论")
 
         except Exception as e:
@@ -137,44 +381,103 @@ class AINewsFetcher:
 
         return items[:max_items]
 
+    MIT_FEED_URL = "https://www.technologyreview.com/topic/artificial-intelligence/feed"
+
+    def _parse_mit_items(self, content: bytes, max_articles: int) -> List[Dict]:
+        """用标准库ElementTree直接解析RSS item，绕过feedparser的纯Python解析器"""
+        articles = []
+        root = ET.fromstring(content)
+
+        for item in root.iter('item'):
+            if len(articles) >= max_articles:
+                break
+
+            title = (item.findtext('title') or '').strip()
+            if not title:
+                continue
+
+            published = ""
+            pub_date = item.findtext('pubDate')
+            if pub_date:
+                try:
+                    published = parsedate_to_datetime(pub_date).strftime('%Y-%m-%d')
+                except (TypeError, ValueError):
+                    pass
+
+            articles.append({
+                'title': title,
+                'url': (item.findtext('link') or '').strip(),
+                'summary': (item.findtext('description') or '')[:300],
+                'published': published,
+                'source': 'MIT Technology Review'
+            })
+
+        return articles
+
+    def _parse_mit_feed(self, feed_source, max_articles: int) -> List[Dict]:
+        """解析MIT Tech Review RSS（feed_source可以是URL或字节内容）"""
+        if isinstance(feed_source, bytes):
+            try:
+                return self._parse_mit_items(feed_source, max_articles)
+            except ET.ParseError:
+                # 非规范XML时退回feedparser的宽容解析
+                pass
+
+        import feedparser  # 延迟导入：正常路径（规范XML）不需要它
+
+        articles = []
+        feed = feedparser.parse(feed_source)
+
+        count = 0
+        for entry in feed.entries:
+            if count >= max_articles:
+                break
+
+            # 解析日期
+            published = ""
+            if hasattr(entry, 'published_parsed'):
+                try:
+                    dt = datetime(*entry.published_parsed[:6])
+                    published = dt.strftime('%Y-%m-%d')
+                except:
+                    pass
+
+            article = {
+                'title': entry.get('title', ''),
+                'url': entry.get('link', ''),
+                'summary': entry.get('summary', '')[:300],
+                'published': published,
+                'source': 'MIT Technology Review'
+            }
+
+            # 只保留近期文章
+            if article['title']:
+                articles.append(article)
+                count += 1
+
+        return articles
+
     def fetch_mit_tech_review(self, max_articles: int = 10) -> List[Dict]:
         """从MIT Technology Review获取AI文章"""
         self.log("📖 正在抓取 MIT Technology Review AI文章...")
 
         articles = []
+        url = self.MIT_FEED_URL
 
         try:
-            url = "https://www.technologyreview.com/topic/artificial-intelligence/feed"
-
-            # 使用feedparser解析RSS
-            feed = feedparser.parse(url)
-
-            count = 0
-            for entry in feed.entries:
-                if count >= max_articles:
-                    break
-
-                # 解析日期
-                published = ""
-                if hasattr(entry, 'published_parsed'):
-                    try:
-                        dt = datetime(*entry.published_parsed[:6])
-                        published = dt.strftime('%Y-%m-%d')
-                    except:
-                        pass
-
-                article = {
-                    'title': entry.get('title', ''),
-                    'url': entry.get('link', ''),
-                    'summary': entry.get('summary', '')[:300],
-                    'published': published,
-                    'source': 'MIT Technology Review'
-                }
-
-                # 只保留近期文章
-                if article['title']:
-                    articles.append(article)
-                    count += 1
+            if HAS_REQUESTS:
+                response = self._session.get(url, headers=self._conditional_headers(url), timeout=30)
+                if response.status_code == 304:
+                    cached = self._load_cached_result(url)
+                    if cached is not None:
+                        self.log(f"♻️ MIT Tech Review未更新，使用缓存 ({len(cached)} 篇)")
+                        return cached[:max_articles]
+                response.raise_for_status()
+                articles = self._parse_mit_feed(response.content, max_articles)
+                self._store_cached_result(url, response.headers.get('ETag'),
+                                          response.headers.get('Last-Modified'), articles)
+            else:
+                articles = self._parse_mit_feed(url, max_articles)
 
             self.log(f"✅ 获取到 {len(articles)} 篇MIT Tech Review文章")
 
@@ -183,6 +486,35 @@ class AINewsFetcher:
 
         return articles[:max_articles]
 
+    async def _fetch_mit(self, session: "aiohttp.ClientSession", max_articles: int = 10) -> List[Dict]:
+        """异步抓取MIT Tech Review文章"""
+        self.log("📖 正在抓取 MIT Technology Review AI文章...")
+
+        articles = []
+        url = self.MIT_FEED_URL
+
+        try:
+            # 自己抓取字节内容后交给feedparser解析，避免feedparser内部阻塞HTTP
+            async with session.get(url, headers=self._conditional_headers(url)) as resp:
+                if resp.status == 304:
+                    cached = self._load_cached_result(url)
+                    if cached is not None:
+                        self.log(f"♻️ MIT Tech Review未更新，使用缓存 ({len(cached)} 篇)")
+                        return cached[:max_articles]
+                resp.raise_for_status()
+                content = await resp.read()
+                etag = resp.headers.get('ETag')
+                last_modified = resp.headers.get('Last-Modified')
+
+            articles = self._parse_mit_feed(content, max_articles)
+            self._store_cached_result(url, etag, last_modified, articles)
+            self.log(f"✅ 获取到 {len(articles)} 篇MIT Tech Review文章")
+
+        except Exception as e:
+            self.log(f"❌ MIT Technology Review获取失败: {e}")
+
+        return articles[:max_articles]
+
     def fetch_github_trending(self, max_items: int = 10) -> List[Dict]:
         """获取GitHub AI相关趋势项目"""
         self.log("⭐ 正在抓取 GitHub AI趋势项目...")
@@ -190,39 +522,27 @@ class AINewsFetcher:
         repos = []
 
         try:
-            # 使用搜索API获取最新的AI相关Python项目
-            url = (
-                "https://api.github.com/search/repositories?"
-                "q=AI+machine-learning+deep-learning+language:python+created:>=" + 
-                (self.one_week_ago.strftime('%Y-%m-%d')) +
-                f"&sort=stars&per_page={max_items}"
-            )
-
-            headers = {
-                'Accept': 'application/vnd.github.v3+json',
-                'User-Agent': 'AI-News-Fetcher'
-            }
+            url = self._github_url(max_items)
+            # GitHub搜索端点同样支持ETag条件请求
+            headers = {**self.GITHUB_HEADERS, **self._conditional_headers(url)}
 
             if HAS_REQUESTS:
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self._session.get(url, headers=headers, timeout=30)
+                if response.status_code == 304:
+                    cached = self._load_cached_result(url)
+                    if cached is not None:
+                        self.log(f"♻️ GitHub趋势未更新，使用缓存 ({len(cached)} 个)")
+                        return cached[:max_items]
                 response.raise_for_status()
                 data = response.json()
+                repos = self._parse_github(data)
+                self._store_cached_result(url, response.headers.get('ETag'),
+                                          response.headers.get('Last-Modified'), repos)
             else:
                 req = urllib.request.Request(url, headers=headers)
                 with urllib.request.urlopen(req, context=self.ssl_context, timeout=30) as resp:
                     data = json.loads(resp.read().decode('utf-8'))
-
-            for repo in data.get('items', []):
-                item = {
-                    'name': repo.get('full_name', ''),
-                    'description': repo.get('description', '')[:300],
-                    'stars': repo.get('stargazers_count', 0),
-                    'language': repo.get('language', ''),
-                    'url': repo.get('html_url', ''),
-                    'updated': repo.get('updated_at', '')[:10],
-                    'source': 'GitHub Trending'
-                }
-                repos.append(item)
+                repos = self._parse_github(data)
 
             self.log(f"✅ 获取到 {len(repos)} 个GitHub项目")
 
@@ -233,17 +553,118 @@ class AINewsFetcher:
 
         return repos[:max_items]
 
-    def aggregate_news(self) -> Dict:
-        """整合所有新闻源"""
+    GITHUB_HEADERS = {
+        'Accept': 'application/vnd.github.v3+json',
+        'User-Agent': 'AI-News-Fetcher'
+    }
+
+    def _github_url(self, max_items: int) -> str:
+        """构造GitHub搜索URL"""
+        # 使用搜索API获取最新的AI相关Python项目
+        return GITHUB_SEARCH_URL.format(urlencode({
+            'q': 'AI machine-learning deep-learning language:python '
+                 f'created:>={self._week_ago_str}',
+            'sort': 'stars',
+            'per_page': max_items
+        }))
+
+    def _parse_github(self, data: Dict) -> List[Dict]:
+        """解析GitHub搜索响应"""
+        repos = []
+        for repo in data.get('items', []):
+            item = {
+                'name': repo.get('full_name', ''),
+                'description': repo.get('description', '')[:300],
+                'stars': repo.get('stargazers_count', 0),
+                'language': repo.get('language', ''),
+                'url': repo.get('html_url', ''),
+                'updated': repo.get('updated_at', '')[:10],
+                'source': 'GitHub Trending'
+            }
+            repos.append(item)
+        return repos
+
+    async def _fetch_github(self, session: "aiohttp.ClientSession", max_items: int = 10) -> List[Dict]:
+        """异步抓取GitHub趋势项目"""
+        self.log("⭐ 正在抓取 GitHub AI趋势项目...")
+
+        repos = []
+        url = self._github_url(max_items)
+
+        try:
+            headers = {**self.GITHUB_HEADERS, **self._conditional_headers(url)}
+            async with session.get(url, headers=headers) as resp:
+                if resp.status == 304:
+                    cached = self._load_cached_result(url)
+                    if cached is not None:
+                        self.log(f"♻️ GitHub趋势未更新，使用缓存 ({len(cached)} 个)")
+                        return cached[:max_items]
+                resp.raise_for_status()
+                data = await resp.json()
+                etag = resp.headers.get('ETag')
+                last_modified = resp.headers.get('Last-Modified')
+
+            repos = self._parse_github(data)
+            self._store_cached_result(url, etag, last_modified, repos)
+            self.log(f"✅ 获取到 {len(repos)} 个GitHub项目")
+
+        except Exception as e:
+            self.log(f"⚠️ GitHub趋势获取跳过（需认证）: {str(e)[:50]}")
+            self.log("💡 手动查看: https://github.com/trending?spoken_language_code=zh")
+
+        return repos[:max_items]
+
+    async def _aggregate_async(self) -> tuple:
+        """并发抓取所有来源，总耗时取决于最慢的来源而非各来源之和"""
+        timeout = aiohttp.ClientTimeout(total=30)
+        connector = aiohttp.TCPConnector(ssl=False, limit=10)
+
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            return await asyncio.gather(
+                self._fetch_arxiv(session, 12),
+                self._fetch_hn(session, 15),
+                self._fetch_mit(session, 8),
+                self._fetch_github(session, 8)
+            )
+
+    def aggregate_news(self, only_new: bool = False) -> Dict:
+        """整合所有新闻源
+
+        Args:
+            only_new: 为True时只保留上次运行后新出现的条目
+        """
         self.log("\n" + "="*60)
         self.log("🚀 开始AI新闻聚合")
         self.log("="*60 + "\n")
 
-        # 并行或顺序获取各来源
-        arxiv_papers = self.fetch_arxiv_papers(12)
-        hn_discussions = self.fetch_hacker_news(15)
-        mit_articles = self.fetch_mit_tech_review(8)
-        github_repos = self.fetch_github_trending(8)
+        if HAS_AIOHTTP:
+            # 并发获取各来源
+            arxiv_papers, hn_discussions, mit_articles, github_repos = \
+                asyncio.run(self._aggregate_async())
+        else:
+            # 无aiohttp时用线程池并发：四个抓取线程阻塞在I/O时都会释放GIL
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                f_arxiv = executor.submit(self.fetch_arxiv_papers, 12)
+                f_hn = executor.submit(self.fetch_hacker_news, 15)
+                f_mit = executor.submit(self.fetch_mit_tech_review, 8)
+                f_github = executor.submit(self.fetch_github_trending, 8)
+
+                arxiv_papers = f_arxiv.result()
+                hn_discussions = f_hn.result()
+                mit_articles = f_mit.result()
+                github_repos = f_github.result()
+
+        # 标记新条目；--only-new模式下过滤掉已见过的内容
+        arxiv_papers = self._mark_new_items('arxiv', arxiv_papers, 'url')
+        hn_discussions = self._mark_new_items('hn', hn_discussions, 'object_id')
+        mit_articles = self._mark_new_items('mit', mit_articles, 'url')
+        github_repos = self._mark_new_items('github', github_repos, 'name')
+
+        if only_new:
+            arxiv_papers = [p for p in arxiv_papers if p.get('is_new', True)]
+            hn_discussions = [i for i in hn_discussions if i.get('is_new', True)]
+            mit_articles = [a for a in mit_articles if a.get('is_new', True)]
+            github_repos = [r for r in github_repos if r.get('is_new', True)]
 
         result = {
             'fetch_time': self.current_date.strftime('%Y-%m-%d %H:%M:%S'),
@@ -270,13 +691,17 @@ class AINewsFetcher:
             report.append("## 📚 ArXiv最新论文")
             report.append("")
             for i, paper in enumerate(data['arxiv_papers'][:8], 1):
-                pub_date = paper['published'][:10] if paper['published'] else 'N/A'
-                report.append(f"### {i}. {paper['title']}")
-                report.append(f"- **发布时间**: {pub_date}")
-                report.append(f"- **链接**: {paper['url']}")
-                report.append(f"- **作者**: {', '.join(paper['authors'][:3])}")
-                report.append(f"- **类别**: {', '.join(paper['categories'][:3])}")
-                report.append("")
+                published = paper['published']
+                pub_date = published[:10] if published else 'N/A'
+                authors = ', '.join(paper['authors'][:3])
+                categories = ', '.join(paper['categories'][:3])
+                report.append(
+                    f"### {i}. {paper['title']}\n"
+                    f"- **发布时间**: {pub_date}\n"
+                    f"- **链接**: {paper['url']}\n"
+                    f"- **作者**: {authors}\n"
+                    f"- **类别**: {categories}\n"
+                )
             report.append("---\n")
 
         # Hacker News
@@ -284,12 +709,15 @@ class AINewsFetcher:
             report.append("## 💬 Hacker News热门讨论")
             report.append("")
             for i, item in enumerate(data['hn_discussions'][:8], 1):
-                report.append(f"### {i}. {item['title']}")
-                report.append(f"- **来源**: [Hacker News](https://news.ycombinator.com/item?id={item.get('object_id', '')})")
-                report.append(f"- **点赞**: {item['points']} | **评论**: {item['num_comments']}")
-                if item['url'] and item['url'] != f"https://news.ycombinator.com/item?id={item.get('objectID', '')}":
-                    report.append(f"- **原文链接**: {item['url']}")
-                report.append("")
+                hn_link = f"https://news.ycombinator.com/item?id={item.get('object_id', '')}"
+                entry = (
+                    f"### {i}. {item['title']}\n"
+                    f"- **来源**: [Hacker News]({hn_link})\n"
+                    f"- **点赞**: {item['points']} | **评论**: {item['num_comments']}\n"
+                )
+                if item['url'] and item['url'] != hn_link:
+                    entry += f"- **原文链接**: {item['url']}\n"
+                report.append(entry)
             report.append("---\n")
 
         # MIT Technology Review
@@ -297,10 +725,11 @@ class AINewsFetcher:
             report.append("## 📖 MIT Technology Review")
             report.append("")
             for i, article in enumerate(data['mit_articles'][:5], 1):
-                report.append(f"### {i}. {article['title']}")
-                report.append(f"- **链接**: {article['url']}")
-                report.append(f"- **发布时间**: {article['published']}")
-                report.append("")
+                report.append(
+                    f"### {i}. {article['title']}\n"
+                    f"- **链接**: {article['url']}\n"
+                    f"- **发布时间**: {article['published']}\n"
+                )
             report.append("---\n")
 
         # GitHub Trending
@@ -308,25 +737,31 @@ class AINewsFetcher:
             report.append("## ⭐ GitHub趋势项目")
             report.append("")
             for i, repo in enumerate(data['github_repos'][:5], 1):
-                report.append(f"### {i}. {repo['name']}")
-                report.append(f"- **描述**: {repo['description']}")
-                report.append(f"- **⭐ Stars**: {repo['stars']}")
-                report.append(f"- **🔤 语言**: {repo['language']}")
-                report.append(f"- **🔗 链接**: {repo['url']}")
-                report.append("")
+                report.append(
+                    f"### {i}. {repo['name']}\n"
+                    f"- **描述**: {repo['description']}\n"
+                    f"- **⭐ Stars**: {repo['stars']}\n"
+                    f"- **🔤 语言**: {repo['language']}\n"
+                    f"- **🔗 链接**: {repo['url']}\n"
+                )
             report.append("---\n")
 
         return "\n".join(report)
 
     def save_to_file(self, data: Dict, output_file: str):
         """保存数据到文件"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if HAS_ORJSON:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         self.log(f"📁 JSON数据已保存: {output_file}")
 
     def save_report(self, report: str, output_file: str):
         """保存Markdown报告"""
-        with open(output_file, 'w', encoding='utf-8') as f:
+        # 大缓冲区一次写出，减少系统调用
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
             f.write(report)
         self.log(f"📄 Markdown报告已保存: {output_file}")
 
@@ -340,10 +775,12 @@ def main():
     parser.add_argument('--format', type=str, default='both',
                         choices=['json', 'markdown', 'both'],
                         help='输出格式')
+    parser.add_argument('--only-new', action='store_true',
+                        help='只输出上次运行后新出现的条目')
     args = parser.parse_args()
 
     fetcher = AINewsFetcher()
-    data = fetcher.aggregate_news()
+    data = fetcher.aggregate_news(only_new=args.only_new)
 
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
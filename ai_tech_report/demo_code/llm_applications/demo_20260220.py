@@ -9,6 +9,7 @@ LLM应用示范代码 - 基于LangChain的AI应用示例
 """
 
 # 导入必要的库
+import asyncio
 import os
 from datetime import datetime
 from typing import List, Dict, Any
@@ -16,7 +17,6 @@ from typing import List, Dict, Any
 # LangChain 核心组件
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
-from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain.text_splitter import CharacterTextSplitter
 from langchain.chains.summarize import load_summarize_chain
@@ -50,9 +50,55 @@ class LLMApplicationDemo:
         self.model_provider = model_provider
         self.model_name = model_name
         self.llm = self._create_llm()
+
+        # 提示词模板只编译一次，各任务方法直接format + invoke，
+        # 省去每次调用重建PromptTemplate/LLMChain对象图的开销
+        self._prompts = {
+            "summary": PromptTemplate(
+                template="请将以下文本简明扼要地摘要成中文摘要:\n\n{text}\n\n摘要:",
+                input_variables=["text"]
+            ),
+            "qa": PromptTemplate(
+                template=(
+                    '基于以下背景信息回答问题。如果信息不足以回答，请说明"信息不足"。\n\n'
+                    "背景信息:\n{context}\n\n问题: {question}\n\n回答:"
+                ),
+                input_variables=["context", "question"]
+            ),
+            "classify": PromptTemplate(
+                template=(
+                    "请分析以下文本，判断它属于哪个类别。\n\n"
+                    "可选类别: {categories}\n\n文本: {text}\n\n"
+                    "请直接输出最可能的类别名称，不要其他解释。"
+                ),
+                input_variables=["categories", "text"]
+            ),
+            "generate": PromptTemplate(
+                template="请根据以下主题生成{description}:\n\n主题: {topic}\n\n内容:",
+                input_variables=["topic", "description"]
+            ),
+            "sentiment": PromptTemplate(
+                template=(
+                    '请分析以下文本的情感倾向，只需输出"正面"、"负面"或"中性"：\n\n'
+                    "文本: {text}\n\n情感倾向:"
+                ),
+                input_variables=["text"]
+            ),
+        }
+
         print(f"✓ LLM应用初始化完成，使用模型: {model_name}")
         print(f"  提供商: {model_provider}")
-        
+
+    def _invoke(self, prompt: str) -> str:
+        """直接调用LLM并取出文本内容"""
+        result = self.llm.invoke(prompt)
+        return result.content if hasattr(result, "content") else str(result)
+
+    async def _ainvoke(self, prompt: str) -> str:
+        """异步调用LLM（ChatOllama/ChatOpenAI均原生支持ainvoke）"""
+        result = await self.llm.ainvoke(prompt)
+        return result.content if hasattr(result, "content") else str(result)
+
     def _create_llm(self):
         """创建LLM实例"""
         if self.model_provider == "openai":
@@ -72,7 +118,7 @@ class LLMApplicationDemo:
         else:
             raise ValueError(f"不支持的模型提供商: {self.model_provider}")
     
-    def text_summarization(self, text: str) -> str:
+    async def text_summarization(self, text: str) -> str:
         """
         文本摘要功能
         将长文本压缩成简洁的摘要
@@ -87,26 +133,13 @@ class LLMApplicationDemo:
         print("📝 应用1: 文本摘要")
         print("="*50)
         
-        # 使用LangChain的摘要链
-        prompt_template = """请将以下文本简明扼要地摘要成中文摘要:
-
-{text}
-
-摘要:"""
-
-        prompt = PromptTemplate(
-            template=prompt_template,
-            input_variables=["text"]
-        )
-        
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        summary = chain.run(text=text)
+        summary = await self._ainvoke(self._prompts["summary"].format(text=text))
         
         print(f"原文长度: {len(text)} 字符")
         print(f"摘要: {summary}")
         return summary
     
-    def question_answering(self, context: str, question: str) -> str:
+    async def question_answering(self, context: str, question: str) -> str:
         """
         问答系统
         基于给定上下文回答问题 (RAG基本原理)
@@ -122,28 +155,15 @@ class LLMApplicationDemo:
         print("❓ 应用2: 问答系统")
         print("="*50)
         
-        prompt_template = """基于以下背景信息回答问题。如果信息不足以回答，请说明"信息不足"。
-
-背景信息:
-{context}
-
-问题: {question}
-
-回答:"""
-
-        prompt = PromptTemplate(
-            template=prompt_template,
-            input_variables=["context", "question"]
+        answer = await self._ainvoke(
+            self._prompts["qa"].format(context=context, question=question)
         )
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        answer = chain.run(context=context, question=question)
-        
         print(f"问题: {question}")
         print(f"答案: {answer}")
         return answer
     
-    def text_classification(self, text: str, categories: List[str]) -> Dict[str, float]:
+    async def text_classification(self, text: str, categories: List[str]) -> Dict[str, float]:
         """
         文本分类
         将文本分类到预定义的类别中
@@ -160,28 +180,16 @@ class LLMApplicationDemo:
         print("="*50)
         
         categories_str = ", ".join(categories)
-        
-        prompt_template = """请分析以下文本，判断它属于哪个类别。
 
-可选类别: {categories}
-
-文本: {text}
-
-请直接输出最可能的类别名称，不要其他解释。"""
-
-        prompt = PromptTemplate(
-            template=prompt_template,
-            input_variables=["categories", "text"]
+        result = await self._ainvoke(
+            self._prompts["classify"].format(categories=categories_str, text=text)
         )
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        result = chain.run(categories=categories_str, text=text)
-        
         print(f"文本: {text[:50]}...")
         print(f"分类结果: {result.strip()}")
         return {"category": result.strip(), "confidence": 1.0}
     
-    def content_generation(self, topic: str, content_type: str = "article") -> str:
+    async def content_generation(self, topic: str, content_type: str = "article") -> str:
         """
         内容生成
         根据主题生成各类内容
@@ -205,27 +213,17 @@ class LLMApplicationDemo:
         }
         
         description = type_descriptions.get(content_type, "内容")
-        
-        prompt_template = """请根据以下主题生成{description}:
 
-主题: {topic}
-
-内容:"""
-
-        prompt = PromptTemplate(
-            template=prompt_template,
-            input_variables=["topic", "description"]
+        content = await self._ainvoke(
+            self._prompts["generate"].format(topic=topic, description=description)
         )
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        content = chain.run(topic=topic, description=description)
-        
         print(f"主题: {topic}")
         print(f"类型: {content_type}")
         print(f"生成内容:\n{content}")
         return content
     
-    def sentiment_analysis(self, text: str) -> str:
+    async def sentiment_analysis(self, text: str) -> str:
         """
         情感分析
         分析文本的情感倾向
@@ -240,19 +238,7 @@ class LLMApplicationDemo:
         print("😊 应用5: 情感分析")
         print("="*50)
         
-        prompt_template = """请分析以下文本的情感倾向，只需输出"正面"、"负面"或"中性"：
-
-文本: {text}
-
-情感倾向:"""
-
-        prompt = PromptTemplate(
-            template=prompt_template,
-            input_variables=["text"]
-        )
-        
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        sentiment = chain.run(text=text)
+        sentiment = await self._ainvoke(self._prompts["sentiment"].format(text=text))
         
         print(f"文本: {text}")
         print(f"情感倾向: {sentiment.strip()}")
@@ -274,27 +260,25 @@ class LLMApplicationDemo:
         企业需要重新思考数据安全策略，以应对新时代的安全挑战。
         """
         
-        # 1. 文本摘要
-        self.text_summarization(sample_text)
-        
-        # 2. 问答系统
-        context = "LLM(大语言模型)是一种使用深度学习技术训练的人工智能模型，
-                  能够理解和生成人类语言。它们通过大规模文本数据进行预训练，
-                  然后可以通过微调适应特定任务。"
+        context = ("LLM(大语言模型)是一种使用深度学习技术训练的人工智能模型，"
+                   "能够理解和生成人类语言。它们通过大规模文本数据进行预训练，"
+                   "然后可以通过微调适应特定任务。")
         question = "什么是LLM？"
-        self.question_answering(context, question)
-        
-        # 3. 文本分类
         news_text = "NASA宣布启动新的艺术合作计划，将艺术家带入太空探索项目"
         categories = ["科技", "艺术", "体育", "财经", "娱乐"]
-        self.text_classification(news_text, categories)
-        
-        # 4. 内容生成
-        self.content_generation("人工智能对未来工作的影响", "article")
-        
-        # 5. 情感分析
-        self.sentiment_analysis("这个产品真是太棒了，我非常喜欢！")
-        
+
+        # 五个任务互相独立，asyncio.gather并发派发，叠加后端的请求延迟
+        async def _dispatch():
+            return await asyncio.gather(
+                self.text_summarization(sample_text),
+                self.question_answering(context, question),
+                self.text_classification(news_text, categories),
+                self.content_generation("人工智能对未来工作的影响", "article"),
+                self.sentiment_analysis("这个产品真是太棒了，我非常喜欢！")
+            )
+
+        asyncio.run(_dispatch())
+
         print("\n" + "✅"*25)
         print("所有演示完成!")
         print("="*50)
@@ -323,27 +307,3 @@ def main():
 if __name__ == "__main__":
     # 运行主程序
     main()
-```
-
-**依赖安装命令:**
-```bash
-pip install langchain langchain-openai langchain-community langchain-ollama python-dotenv
-```
-
-**使用说明:**
-1. 推荐使用Ollama本地模型(免费): 先安装Ollama，然后运行`ollama pull llama2`
-2. 也可使用OpenAI API: 设置`OPENAI_API_KEY`环境变量并改为`model_provider="openai"`
-
-[2m⏱️  Step 1 completed in 62.99s (total: 62.99s)[0m
-
-[1m[96mSession Statistics:[0m
-[2m────────────────────────────────────────[0m
-  Session Duration: 00:01:03
-  Total Messages: 3
-    - User Messages: [92m1[0m
-    - Assistant Replies: [94m1[0m
-    - Tool Calls: [93m0[0m
-  Available Tools: 8
-  API Tokens Used: [95m6,413[0m
-[2m────────────────────────────────────────[0m
-
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+金融分析报告生成器 - 趋势分类内核
+Trend Classification Kernel
+
+把逐指数的阈值级联抽成纯数值函数，装上numba即编译为机器码；
+未安装numba时退化为同签名的纯Python实现，调用方无感知
+"""
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """numba缺席时的空装饰器，保持@njit(cache=True)写法可用"""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrapper(func):
+            return func
+
+        return wrapper
+
+
+# 趋势桶编码: 0=强势下跌 1=温和下跌 2=横盘整理 3=温和上涨 4=强势上涨
+@njit(cache=True)
+def classify_trend(change_percent: float) -> int:
+    """把涨跌幅归入五个趋势桶之一，返回整数编码"""
+    if change_percent > 1.0:
+        return 4
+    if change_percent > 0.2:
+        return 3
+    if change_percent < -1.0:
+        return 0
+    if change_percent < -0.2:
+        return 1
+    return 2
+
+
+def classify_trend_many(values) -> list:
+    """批量分类：一次调用得到全部编码，None归入-1由调用方映射"未知"；
+    装有numba时循环体内的标量级联已是编译代码"""
+    return [-1 if v is None else classify_trend(v) for v in values]
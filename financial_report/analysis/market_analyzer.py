@@ -6,15 +6,35 @@ Market Analysis Module
 使用AI对收集的市场数据进行分析
 """
 
+import bisect
+import functools
+import hashlib
+import logging
+import math
+import heapq
 import os
+import time
+import pickle
 import sys
 import json
+import re
+from collections import Counter, namedtuple
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 # 添加父目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _trend_njit import classify_trend, classify_trend_many
+
+# orjson为C实现的JSON序列化器，深层嵌套报告比标准json快数倍；未安装时回退
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 try:
     from config import config
@@ -25,26 +45,242 @@ except ImportError:
     config = DefaultConfig()
 
 
+# 热路径进度信息走logger：级别高于INFO时调用几乎零成本，
+# 不再为每次分析付stdout刷新和emoji编码的固定开销
+logger = logging.getLogger(__name__)
+
+# 趋势标签按_trend_njit.classify_trend的整数编码索引
+_TREND_LABELS = ("强势下跌 📉", "温和下跌 📉", "横盘整理 ➡️", "温和上涨 📊", "强势上涨 📈")
+
+# 支撑/阻力位的固定比例，模块级常量避免每次调用重建
+_SUPPORT_MULT = (0.98, 0.95, 0.92)
+_RESIST_MULT = (1.02, 1.05, 1.08)
+
+# 静态分析模板：内容不随输入变化，提升为模块常量免去每次调用
+# 重建几十个dict/list/str对象（调用方按只读使用，勿原地修改）
+_GOLD_FUNDAMENTALS = {
+    "inflation_hedge": {
+        "status": "正面",
+        "description": "通胀预期支撑黄金需求",
+        "impact": "中长期利好"
+    },
+    "usd_strength": {
+        "status": "中性",
+        "description": "美元走势对黄金形成压制",
+        "impact": "短期利空"
+    },
+    "geopolitical": {
+        "status": "正面",
+        "description": "地缘政治不确定性支撑避险需求",
+        "impact": "短期利好"
+    },
+    "central_bank": {
+        "status": "正面",
+        "description": "全球央行持续购金",
+        "impact": "中长期利好"
+    }
+}
+
+_CN_SECTORS = {
+    "表现强势": ["人工智能", "新能源车", "半导体"],
+    "表现弱势": ["房地产", "传统能源", "银行"],
+    "轮动特点": "市场板块轮动较快，建议关注业绩主线"
+}
+
+_GLOBAL_KEY_DRIVERS = [
+    "美联储货币政策预期",
+    "全球经济增长前景",
+    "地缘政治风险",
+    "企业财报表现"
+]
+
+_CROSS_MARKET_COMPARISON = {
+    "performance_ranking": ["美股", "A股", "黄金"],
+    "correlation_notes": [
+        "黄金与美股通常呈负相关",
+        "A股受国内政策影响较大",
+        "美股走势受全球资金流向影响"
+    ],
+    "allocation_suggestion": {
+        "conservative": "60% 美股 + 30% 黄金 + 10% A股",
+        "balanced": "50% 美股 + 25% A股 + 25% 黄金",
+        "aggressive": "60% A股 + 30% 美股 + 10% 黄金"
+    }
+}
+
+# 投资建议按 低/中/高 三档查表，bisect替代if/elif级联；
+# 上界取nextafter保持原先"严格大于"的边界语义
+_REC_BOUNDS_1 = (-1.0, math.nextafter(1.0, math.inf))
+_REC_BOUNDS_HALF = (-0.5, math.nextafter(0.5, math.inf))
+
+_GOLD_RECS = (
+    {"action": "关注支撑", "reason": "价格回调后可考虑分批建仓", "risk_level": "中等偏高"},
+    {"action": "观望等待", "reason": "市场方向不明，建议轻仓观望", "risk_level": "低"},
+    {"action": "谨慎追高", "reason": "短期涨幅较大，建议等待回调后介入", "risk_level": "中等"},
+)
+_US_RECS = (
+    {"action": "逢低布局", "reason": "优质标的回调后关注低吸机会", "risk_level": "中等偏高"},
+    {"action": "持有观望", "reason": "市场方向不明，保持现有仓位", "risk_level": "低"},
+    {"action": "适度减仓", "reason": "短期涨幅较大，警惕回调风险", "risk_level": "中等"},
+)
+_CN_RECS = (
+    {"action": "分批建仓", "reason": "回调是布局优质股的机会", "risk_level": "中等偏高"},
+    {"action": "持股待涨", "reason": "市场震荡筑底，保持耐心", "risk_level": "低"},
+    {"action": "适度减仓", "reason": "短期涨幅较大，适当锁定利润", "risk_level": "中等"},
+)
+
+_OUTLOOK_TEMPLATES = {
+    "gold": {
+        "bullish": "黄金价格保持强势，若能突破$2,050阻力位，有望进一步上行。避险需求和央行购金为金价提供支撑。",
+        "neutral": "黄金价格维持区间震荡，建议关注$2,000-2,050区间的突破方向。",
+        "bearish": "黄金价格承压回调，下方关注$2,000整数关口支撑。若失守，可能回测$1,980附近。"
+    }
+}
+
+_GLOBAL_RISK = {
+    "overall_risk_level": "中等",
+    "risk_factors": [
+        "货币政策不确定性",
+        "地缘政治紧张",
+        "通胀预期波动",
+        "企业盈利压力"
+    ],
+    "mitigation_suggestions": [
+        "分散投资于不同资产类别",
+        "保持适当现金仓位",
+        "关注基本面优质的标的",
+        "设置合理的止损位"
+    ]
+}
+
+# 主题关键词多模式匹配：一次正则扫描替代每标题5次in子串查找；
+# 主题集合固定且只有3个，用位掩码累积命中，省掉set的哈希与双重分配
+_THEME_RE = re.compile("美联储|利率|通胀|避险|地缘")
+_THEMES = ("货币政策", "通胀预期", "避险需求")
+_THEME_BITS = {
+    "美联储": 1,
+    "利率": 1,
+    "通胀": 2,
+    "避险": 4,
+    "地缘": 4,
+}
+
+
+# 指数涨跌幅的列式汇总：均值与涨跌家数一次遍历算齐，
+# 供状态/广度/展望/建议各消费方共享，不再各自重新归约
+_ChangeStats = namedtuple("_ChangeStats", ["avg", "advance", "decline"])
+
+
+def _summarize_changes(changes: List[float]) -> Optional[_ChangeStats]:
+    """单趟遍历汇总涨跌幅；无数据时返回None"""
+    if not changes:
+        return None
+
+    total = 0.0
+    advance = decline = 0
+    for c in changes:
+        total += c
+        if c > 0:
+            advance += 1
+        elif c < 0:
+            decline += 1
+
+    return _ChangeStats(total / len(changes), advance, decline)
+
+
+@functools.lru_cache(maxsize=64)
+def _split_path(path: str) -> tuple:
+    """点分路径只切分一次，后续调用直接命中缓存"""
+    return tuple(path.split("."))
+
+
+def _dig(obj: Any, path: str, default: Any = None) -> Any:
+    """按点分路径读取嵌套字段，替代链式.get(k, {})——
+    后者每级都要分配一个随手丢弃的空字典默认值"""
+    for key in _split_path(path):
+        if not isinstance(obj, dict):
+            return default
+        obj = obj.get(key)
+        if obj is None:
+            return default
+    return obj
+
+
+@functools.lru_cache(maxsize=2)
+def _iso_now(bucket: int) -> str:
+    """按秒分桶缓存的ISO时间戳：批量生成报告时，同一秒内的
+    重复调用退化为一次整数除法加字典查找"""
+    return datetime.fromtimestamp(bucket).isoformat()
+
+
+def _data_key(data: Dict[str, Any]) -> bytes:
+    """对输入数据做稳定哈希，作为分析结果的缓存键"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
 class MarketAnalyzer:
     """市场分析器"""
-    
+
+    # 固定槽位替代实例__dict__：属性访问走固定偏移，实例更小
+    __slots__ = ("ai_config", "_analysis_cache", "_cache_file")
+
     def __init__(self):
         self.ai_config = getattr(config, 'AI_ANALYSIS', {"enabled": True})
-    
+
+        # 分析结果缓存：同样的输入数据（重试、多格式渲染）直接命中，
+        # 并通过pickle落盘让重复的CLI调用也能跳过重复分析
+        self._analysis_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._cache_file: Optional[Path] = None
+
+        cache_cfg = getattr(config, 'CACHE', {})
+        if cache_cfg.get("enabled"):
+            cache_dir = Path(cache_cfg.get("cache_dir", ".cache"))
+            self._cache_file = cache_dir / "market_analysis_cache.pkl"
+            try:
+                with open(self._cache_file, "rb") as f:
+                    self._analysis_cache = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                self._analysis_cache = {}
+
+    def _memoized(self, market: str, data: Dict[str, Any], compute) -> Dict[str, Any]:
+        """按(市场, 数据哈希)缓存分析结果，命中时为O(1)字典查找"""
+        key = (market, _data_key(data))
+        hit = self._analysis_cache.get(key)
+        if hit is not None:
+            return hit
+
+        result = compute(data)
+        self._analysis_cache[key] = result
+
+        if self._cache_file is not None:
+            try:
+                self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self._cache_file, "wb") as f:
+                    pickle.dump(self._analysis_cache, f)
+            except OSError:
+                pass
+
+        return result
+
     def analyze_gold_market(self, gold_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         分析黄金市场
-        
+
         Args:
             gold_data: 黄金市场数据
-        
+
         Returns:
             黄金市场分析结果
         """
-        print("🥇 分析黄金市场...")
-        
-        futures = gold_data.get("markets", {}).get("futures", {})
-        spot = gold_data.get("markets", {}).get("spot", {})
+        return self._memoized("gold", gold_data, self._analyze_gold_market)
+
+    def _analyze_gold_market(self, gold_data: Dict[str, Any]) -> Dict[str, Any]:
+        """黄金市场分析的实际计算路径（缓存未命中时调用）"""
+        logger.info("分析黄金市场")
+
+        futures = _dig(gold_data, "markets.futures", {})
+        spot = _dig(gold_data, "markets.spot", {})
         
         # 提取关键数据
         current_price = futures.get("close") or spot.get("price")
@@ -68,66 +304,28 @@ class MarketAnalyzer:
         return analysis
     
     def _determine_trend(self, change_percent: float) -> str:
-        """判断趋势"""
+        """判断趋势：数值级联走编译内核，标签查表得出"""
         if change_percent is None:
             return "未知"
-        elif change_percent > 1.0:
-            return "强势上涨 📈"
-        elif change_percent > 0.2:
-            return "温和上涨 📊"
-        elif change_percent < -1.0:
-            return "强势下跌 📉"
-        elif change_percent < -0.2:
-            return "温和下跌 📉"
-        else:
-            return "横盘整理 ➡️"
+        return _TREND_LABELS[classify_trend(change_percent)]
     
     def _calculate_support_levels(self, price: float) -> List[float]:
         """计算支撑位"""
         if price is None:
             return []
-        
-        return [
-            round(price * 0.98, 2),
-            round(price * 0.95, 2),
-            round(price * 0.92, 2)
-        ]
-    
+
+        return [round(price * m, 2) for m in _SUPPORT_MULT]
+
     def _calculate_resistance_levels(self, price: float) -> List[float]:
         """计算阻力位"""
         if price is None:
             return []
-        
-        return [
-            round(price * 1.02, 2),
-            round(price * 1.05, 2),
-            round(price * 1.08, 2)
-        ]
+
+        return [round(price * m, 2) for m in _RESIST_MULT]
     
     def _analyze_gold_fundamentals(self) -> Dict[str, Any]:
         """分析黄金基本面因素"""
-        return {
-            "inflation_hedge": {
-                "status": "正面",
-                "description": "通胀预期支撑黄金需求",
-                "impact": "中长期利好"
-            },
-            "usd_strength": {
-                "status": "中性",
-                "description": "美元走势对黄金形成压制",
-                "impact": "短期利空"
-            },
-            "geopolitical": {
-                "status": "正面",
-                "description": "地缘政治不确定性支撑避险需求",
-                "impact": "短期利好"
-            },
-            "central_bank": {
-                "status": "正面",
-                "description": "全球央行持续购金",
-                "impact": "中长期利好"
-            }
-        }
+        return _GOLD_FUNDAMENTALS
     
     def _analyze_gold_technicals(self, futures_data: Dict[str, Any]) -> Dict[str, Any]:
         """分析黄金技术指标"""
@@ -154,11 +352,19 @@ class MarketAnalyzer:
         """分析市场情绪"""
         if not news:
             return {"overall": "中性", "confidence": "低"}
-        
-        sentiments = [n.get("sentiment", "neutral") for n in news]
-        positive = sentiments.count("positive")
-        negative = sentiments.count("negative")
-        
+
+        # 单趟遍历同时完成情绪计数与主题提取，
+        # 替代原先的情绪列表构建+两次count+主题独立扫描共三遍
+        counts = Counter()
+        theme_mask = 0
+        for item in news:
+            counts[item.get("sentiment", "neutral")] += 1
+            for keyword in _THEME_RE.findall(item.get("title", "")):
+                theme_mask |= _THEME_BITS[keyword]
+
+        positive = counts["positive"]
+        negative = counts["negative"]
+
         if positive > negative:
             overall = "偏正面 😊"
             confidence = "中"
@@ -168,67 +374,31 @@ class MarketAnalyzer:
         else:
             overall = "中性 😐"
             confidence = "低"
-        
+
         return {
             "overall": overall,
             "positive_count": positive,
             "negative_count": negative,
             "confidence": confidence,
-            "key_themes": self._extract_key_themes(news)
+            "key_themes": [t for i, t in enumerate(_THEMES)
+                           if theme_mask & (1 << i)]
         }
     
-    def _extract_key_themes(self, news: List[Dict]) -> List[str]:
-        """提取新闻主题"""
-        themes = []
-        for item in news:
-            title = item.get("title", "")
-            if "美联储" in title or "利率" in title:
-                themes.append("货币政策")
-            if "通胀" in title:
-                themes.append("通胀预期")
-            if "避险" in title or "地缘" in title:
-                themes.append("避险需求")
-        return list(set(themes))
-    
     def _generate_outlook(self, market: str, price: float, change: float) -> str:
         """生成市场展望"""
-        outlook_templates = {
-            "gold": {
-                "bullish": "黄金价格保持强势，若能突破$2,050阻力位，有望进一步上行。避险需求和央行购金为金价提供支撑。",
-                "neutral": "黄金价格维持区间震荡，建议关注$2,000-2,050区间的突破方向。",
-                "bearish": "黄金价格承压回调，下方关注$2,000整数关口支撑。若失守，可能回测$1,980附近。"
-            }
-        }
-        
-        if change and change > 0.5:
+        change = change or 0
+        if change > 0.5:
             sentiment = "bullish"
-        elif change and change < -0.5:
+        elif change < -0.5:
             sentiment = "bearish"
         else:
             sentiment = "neutral"
-        
-        return outlook_templates.get(market, {}).get(sentiment, "市场走势不明朗，需进一步观察。")
+
+        return _OUTLOOK_TEMPLATES.get(market, {}).get(sentiment, "市场走势不明朗，需进一步观察。")
     
     def _generate_recommendation(self, market: str, change: float) -> Dict[str, str]:
         """生成投资建议"""
-        if change and change > 1.0:
-            return {
-                "action": "谨慎追高",
-                "reason": "短期涨幅较大，建议等待回调后介入",
-                "risk_level": "中等"
-            }
-        elif change and change < -1.0:
-            return {
-                "action": "关注支撑",
-                "reason": "价格回调后可考虑分批建仓",
-                "risk_level": "中等偏高"
-            }
-        else:
-            return {
-                "action": "观望等待",
-                "reason": "市场方向不明，建议轻仓观望",
-                "risk_level": "低"
-            }
+        return _GOLD_RECS[bisect.bisect(_REC_BOUNDS_1, change or 0)]
     
     def analyze_us_stocks(self, stocks_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -240,53 +410,68 @@ class MarketAnalyzer:
         Returns:
             美股市场分析结果
         """
-        print("🇺🇸 分析美股市场...")
-        
-        indices = stocks_data.get("markets", {}).get("indices", {})
+        return self._memoized("us_stocks", stocks_data, self._analyze_us_stocks)
+
+    def _analyze_us_stocks(self, stocks_data: Dict[str, Any]) -> Dict[str, Any]:
+        """美股市场分析的实际计算路径（缓存未命中时调用）"""
+        logger.info("分析美股市场")
+
+        indices = _dig(stocks_data, "markets.indices", {})
         sentiment = stocks_data.get("sentiment", {})
         economic = stocks_data.get("economic_calendar", [])
         
-        # 分析各指数
-        index_analysis = {}
-        for symbol, data in indices.items():
-            if "close" in data:
-                index_analysis[symbol] = {
-                    "name": data.get("name"),
-                    "close": data.get("close"),
-                    "change_percent": data.get("change_percent"),
-                    "trend": self._determine_trend(data.get("change_percent"))
-                }
-        
+        # 分析各指数：趋势编码批量分类一次得出，循环内只剩查表
+        valid_indices = [(s, d) for s, d in indices.items() if "close" in d]
+        codes = classify_trend_many(d.get("change_percent")
+                                    for _, d in valid_indices)
+        index_analysis = {
+            symbol: {
+                "name": data.get("name"),
+                "close": data.get("close"),
+                "change_percent": data.get("change_percent"),
+                "trend": "未知" if code < 0 else _TREND_LABELS[code]
+            }
+            for (symbol, data), code in zip(valid_indices, codes)
+        }
+
+        # 涨跌幅汇总只算一次，供下游各评估函数共享，
+        # 免去每个helper各自重扫字典再重复归约
+        stats = _summarize_changes(
+            [c for c in (d.get("change_percent")
+                         for d in index_analysis.values())
+             if c is not None]
+        )
+
+        leading_sectors, lagging_sectors = self._rank_stocks(stocks_data)
+
         # 综合分析
         analysis = {
             "market_overview": {
-                "status": self._assess_market_status(index_analysis),
-                "breadth": self._calculate_market_breadth(index_analysis),
-                "leading_sectors": self._identify_leading_sectors(stocks_data),
-                "lagging_sectors": self._identify_lagging_sectors(stocks_data)
+                "status": self._assess_market_status(stats),
+                "breadth": self._calculate_market_breadth(stats),
+                "leading_sectors": leading_sectors,
+                "lagging_sectors": lagging_sectors
             },
             "index_analysis": index_analysis,
             "market_sentiment": {
                 "vix": sentiment.get("vix_index", {}),
                 "fear_greed": sentiment.get("fear_greed_index", {}),
-                "overall": "偏乐观" if sentiment.get("fear_greed_index", {}).get("value", 50) > 50 else "偏谨慎"
+                "overall": "偏乐观" if _dig(sentiment, "fear_greed_index.value", 50) > 50 else "偏谨慎"
             },
             "economic_events": economic[:3],  # 取前3个重要事件
-            "outlook": self._generate_us_market_outlook(index_analysis),
-            "recommendation": self._generate_us_recommendation(index_analysis)
+            "outlook": self._generate_us_market_outlook(stats),
+            "recommendation": self._generate_us_recommendation(stats)
         }
-        
+
         return analysis
-    
-    def _assess_market_status(self, indices: Dict) -> str:
+
+    def _assess_market_status(self, stats: Optional[_ChangeStats]) -> str:
         """评估市场状态"""
-        changes = [d.get("change_percent", 0) for d in indices.values() if "close" in d]
-        
-        if not changes:
+        if stats is None:
             return "数据不足"
-        
-        avg_change = sum(changes) / len(changes)
-        
+
+        avg_change = stats.avg
+
         if avg_change > 0.5:
             return "强势上涨 📈"
         elif avg_change > 0.1:
@@ -298,58 +483,42 @@ class MarketAnalyzer:
         else:
             return "横盘整理"
     
-    def _calculate_market_breadth(self, indices: Dict) -> Dict[str, Any]:
+    def _calculate_market_breadth(self, stats: Optional[_ChangeStats]) -> Dict[str, Any]:
         """计算市场广度"""
-        changes = [d.get("change_percent", 0) for d in indices.values() if "close" in d]
-        
-        if not changes:
+        if stats is None:
             return {"advance": 0, "decline": 0, "breadth": "未知"}
-        
-        advance = len([c for c in changes if c > 0])
-        decline = len([c for c in changes if c < 0])
-        
+
+        advance = stats.advance
+        decline = stats.decline
+
         return {
             "advance": advance,
             "decline": decline,
             "breadth": f"{advance}:{decline}" if advance + decline > 0 else "数据不足"
         }
     
-    def _identify_leading_sectors(self, stocks_data: Dict) -> List[str]:
-        """识别领涨板块"""
-        stocks = stocks_data.get("markets", {}).get("popular_stocks", {})
-        
-        if not stocks:
-            return ["科技股", "消费股"]
-        
-        # 基于涨幅排序
-        sorted_stocks = sorted(
-            [(s, d.get("change_percent", 0)) for s, d in stocks.items() if "price" in d],
-            key=lambda x: x[1],
-            reverse=True
-        )[:3]
-        
-        return [f"{symbol} ({change:+.1f}%)" for symbol, change in sorted_stocks]
-    
-    def _identify_lagging_sectors(self, stocks_data: Dict) -> List[str]:
-        """识别领跌板块"""
-        stocks = stocks_data.get("markets", {}).get("popular_stocks", {})
-        
+    def _rank_stocks(self, stocks_data: Dict) -> tuple:
+        """识别领涨/领跌板块：(代码, 涨幅)列表只构建一次，
+        堆取前3/后3替代两次全量排序"""
+        stocks = _dig(stocks_data, "markets.popular_stocks", {})
+
         if not stocks:
-            return ["能源股", "金融股"]
-        
-        # 基于涨幅排序
-        sorted_stocks = sorted(
-            [(s, d.get("change_percent", 0)) for s, d in stocks.items() if "price" in d],
-            key=lambda x: x[1]
-        )[:3]
-        
-        return [f"{symbol} ({change:+.1f}%)" for symbol, change in sorted_stocks]
+            return ["科技股", "消费股"], ["能源股", "金融股"]
+
+        pairs = [(s, d.get("change_percent", 0))
+                 for s, d in stocks.items() if "price" in d]
+        leaders = heapq.nlargest(3, pairs, key=lambda x: x[1])
+        laggers = heapq.nsmallest(3, pairs, key=lambda x: x[1])
+
+        return (
+            [f"{symbol} ({change:+.1f}%)" for symbol, change in leaders],
+            [f"{symbol} ({change:+.1f}%)" for symbol, change in laggers]
+        )
     
-    def _generate_us_market_outlook(self, indices: Dict) -> str:
+    def _generate_us_market_outlook(self, stats: Optional[_ChangeStats]) -> str:
         """生成美股展望"""
-        changes = [d.get("change_percent", 0) for d in indices.values() if "close" in d]
-        avg_change = sum(changes) / len(changes) if changes else 0
-        
+        avg_change = stats.avg if stats else 0
+
         if avg_change > 0.3:
             return "美股三大指数集体上扬，市场情绪乐观。科技股领涨带动人气，成交量配合良好。短期有望延续升势。"
         elif avg_change < -0.3:
@@ -357,17 +526,9 @@ class MarketAnalyzer:
         else:
             return "美股市场维持震荡整理格局，涨跌互现。投资者情绪谨慎，等待更多经济数据指引方向。"
     
-    def _generate_us_recommendation(self, indices: Dict) -> Dict[str, str]:
+    def _generate_us_recommendation(self, stats: Optional[_ChangeStats]) -> Dict[str, str]:
         """生成美股建议"""
-        changes = [d.get("change_percent", 0) for d in indices.values() if "close" in d]
-        avg_change = sum(changes) / len(changes) if changes else 0
-        
-        if avg_change > 1.0:
-            return {"action": "适度减仓", "reason": "短期涨幅较大，警惕回调风险", "risk_level": "中等"}
-        elif avg_change < -1.0:
-            return {"action": "逢低布局", "reason": "优质标的回调后关注低吸机会", "risk_level": "中等偏高"}
-        else:
-            return {"action": "持有观望", "reason": "市场方向不明，保持现有仓位", "risk_level": "低"}
+        return _US_RECS[bisect.bisect(_REC_BOUNDS_1, stats.avg if stats else 0)]
     
     def analyze_cn_stocks(self, cn_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -379,54 +540,69 @@ class MarketAnalyzer:
         Returns:
             A股市场分析结果
         """
-        print("🇨🇳 分析A股市场...")
-        
-        indices = cn_data.get("markets", {}).get("indices", {})
+        return self._memoized("cn_stocks", cn_data, self._analyze_cn_stocks)
+
+    def _analyze_cn_stocks(self, cn_data: Dict[str, Any]) -> Dict[str, Any]:
+        """A股市场分析的实际计算路径（缓存未命中时调用）"""
+        logger.info("分析A股市场")
+
+        indices = _dig(cn_data, "markets.indices", {})
         sentiment = cn_data.get("sentiment", {})
         news = cn_data.get("policy_news", [])
         
-        # 分析各指数
-        index_analysis = {}
-        for symbol, data in indices.items():
-            if "close" in data:
-                index_analysis[symbol] = {
-                    "name": data.get("name"),
-                    "close": data.get("close"),
-                    "change_percent": data.get("change_percent"),
-                    "turnover": data.get("volume"),
-                    "trend": self._determine_trend(data.get("change_percent"))
-                }
-        
+        # 分析各指数：趋势编码批量分类一次得出，循环内只剩查表
+        valid_indices = [(s, d) for s, d in indices.items() if "close" in d]
+        codes = classify_trend_many(d.get("change_percent")
+                                    for _, d in valid_indices)
+        index_analysis = {
+            symbol: {
+                "name": data.get("name"),
+                "close": data.get("close"),
+                "change_percent": data.get("change_percent"),
+                "turnover": data.get("volume"),
+                "trend": "未知" if code < 0 else _TREND_LABELS[code]
+            }
+            for (symbol, data), code in zip(valid_indices, codes)
+        }
+
+        # 涨跌幅汇总只算一次，供下游各评估函数共享；
+        # 名称→涨跌幅映射让按指数名取值变成O(1)查表而非线性扫描
+        stats = _summarize_changes(
+            [c for c in (d.get("change_percent")
+                         for d in index_analysis.values())
+             if c is not None]
+        )
+        name_to_change = {d.get("name"): d.get("change_percent")
+                          for d in index_analysis.values()}
+
         # 综合分析
         analysis = {
             "market_overview": {
-                "status": self._assess_cn_market_status(index_analysis),
+                "status": self._assess_cn_market_status(stats, name_to_change),
                 "market_cap": sentiment.get("market_capitalization", {}),
                 "turnover_rate": sentiment.get("turnover_rate", {})
             },
             "index_analysis": index_analysis,
             "capital_flow": {
-                "north_money": sentiment.get("main_inflow", {}).get("north_money", {}),
-                "south_money": sentiment.get("main_inflow", {}).get("south_money", {})
+                "north_money": _dig(sentiment, "main_inflow.north_money", {}),
+                "south_money": _dig(sentiment, "main_inflow.south_money", {})
             },
             "policy_news": news,
             "sector_performance": self._analyze_cn_sectors(index_analysis),
-            "outlook": self._generate_cn_market_outlook(index_analysis),
-            "recommendation": self._generate_cn_recommendation(index_analysis)
+            "outlook": self._generate_cn_market_outlook(stats),
+            "recommendation": self._generate_cn_recommendation(stats)
         }
-        
+
         return analysis
-    
-    def _assess_cn_market_status(self, indices: Dict) -> str:
+
+    def _assess_cn_market_status(self, stats: Optional[_ChangeStats],
+                                 name_to_change: Dict[str, float]) -> str:
         """评估A股市场状态"""
-        changes = [d.get("change_percent", 0) for d in indices.values() if "close" in d]
-        
-        if not changes:
+        if stats is None:
             return "数据不足"
-        
-        sh_change = next((d.get("change_percent") for d in indices.values() 
-                         if d.get("name") == "上证指数"), 0)
-        
+
+        sh_change = name_to_change.get("上证指数") or 0
+
         if sh_change > 0.5:
             return "沪指震荡走强 📈"
         elif sh_change > 0.1:
@@ -440,17 +616,12 @@ class MarketAnalyzer:
     
     def _analyze_cn_sectors(self, indices: Dict) -> Dict[str, str]:
         """分析A股板块表现"""
-        return {
-            "表现强势": ["人工智能", "新能源车", "半导体"],
-            "表现弱势": ["房地产", "传统能源", "银行"],
-            "轮动特点": "市场板块轮动较快，建议关注业绩主线"
-        }
+        return _CN_SECTORS
     
-    def _generate_cn_market_outlook(self, indices: Dict) -> str:
+    def _generate_cn_market_outlook(self, stats: Optional[_ChangeStats]) -> str:
         """生成A股展望"""
-        changes = [d.get("change_percent", 0) for d in indices.values() if "close" in d]
-        avg_change = sum(changes) / len(changes) if changes else 0
-        
+        avg_change = stats.avg if stats else 0
+
         if avg_change > 0.2:
             return "A股市场震荡攀升，成交量温和放大。政策暖风频吹，市场情绪逐步回暖。短期有望挑战2900点整数关口。"
         elif avg_change < -0.2:
@@ -458,17 +629,9 @@ class MarketAnalyzer:
         else:
             return "A股市场维持窄幅震荡，方向选择临近。建议关注量能变化和外资流向，等待突破方向明朗。"
     
-    def _generate_cn_recommendation(self, indices: Dict) -> Dict[str, str]:
+    def _generate_cn_recommendation(self, stats: Optional[_ChangeStats]) -> Dict[str, str]:
         """生成A股建议"""
-        changes = [d.get("change_percent", 0) for d in indices.values() if "close" in d]
-        avg_change = sum(changes) / len(changes) if changes else 0
-        
-        if avg_change > 0.5:
-            return {"action": "适度减仓", "reason": "短期涨幅较大，适当锁定利润", "risk_level": "中等"}
-        elif avg_change < -0.5:
-            return {"action": "分批建仓", "reason": "回调是布局优质股的机会", "risk_level": "中等偏高"}
-        else:
-            return {"action": "持股待涨", "reason": "市场震荡筑底，保持耐心", "risk_level": "低"}
+        return _CN_RECS[bisect.bisect(_REC_BOUNDS_HALF, stats.avg if stats else 0)]
     
     def generate_comprehensive_analysis(
         self, 
@@ -487,11 +650,23 @@ class MarketAnalyzer:
         Returns:
             综合分析报告
         """
-        print("📊 生成综合分析报告...")
-        
-        gold_analysis = self.analyze_gold_market(gold_data)
-        us_analysis = self.analyze_us_stocks(us_stocks_data)
-        cn_analysis = self.analyze_cn_stocks(cn_stocks_data)
+        logger.info("生成综合分析报告")
+
+        # 三个市场分析互相独立，并发派发；parallel=False时保留串行便于调试
+        if self.ai_config.get("parallel", True):
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                f_gold = executor.submit(self.analyze_gold_market, gold_data)
+                f_us = executor.submit(self.analyze_us_stocks, us_stocks_data)
+                f_cn = executor.submit(self.analyze_cn_stocks, cn_stocks_data)
+                gold_analysis = f_gold.result()
+                us_analysis = f_us.result()
+                cn_analysis = f_cn.result()
+        else:
+            gold_analysis = self.analyze_gold_market(gold_data)
+            us_analysis = self.analyze_us_stocks(us_stocks_data)
+            cn_analysis = self.analyze_cn_stocks(cn_stocks_data)
         
         # 生成全球市场概览
         global_overview = self._generate_global_overview(
@@ -504,7 +679,7 @@ class MarketAnalyzer:
         )
         
         report = {
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": _iso_now(time.time_ns() // 1_000_000_000),
             "global_overview": global_overview,
             "gold_market": gold_analysis,
             "us_market": us_analysis,
@@ -519,7 +694,17 @@ class MarketAnalyzer:
         }
         
         return report
-    
+
+    def to_json_bytes(self, report: Dict[str, Any]) -> bytes:
+        """序列化分析报告为UTF-8 JSON字节串
+
+        orjson可用时走其C实现；否则退回标准json（ensure_ascii=False
+        避免把中文逐字转义成\\uXXXX，输出更小也更快）
+        """
+        if HAS_ORJSON:
+            return orjson.dumps(report)
+        return json.dumps(report, ensure_ascii=False).encode("utf-8")
+
     def _generate_global_overview(
         self, 
         gold: Dict, 
@@ -527,14 +712,10 @@ class MarketAnalyzer:
         cn: Dict
     ) -> Dict[str, Any]:
         """生成全球市场概览"""
+        # 只有overall_status依赖输入，常量部分直接引用模块级对象
         return {
-            "overall_status": "风险偏好回升" if us.get("market_sentiment", {}).get("fear_greed", {}).get("value", 50) > 55 else "市场情绪谨慎",
-            "key_drivers": [
-                "美联储货币政策预期",
-                "全球经济增长前景",
-                "地缘政治风险",
-                "企业财报表现"
-            ],
+            "overall_status": "风险偏好回升" if _dig(us, "market_sentiment.fear_greed.value", 50) > 55 else "市场情绪谨慎",
+            "key_drivers": _GLOBAL_KEY_DRIVERS,
             "summary": "全球市场表现分化，美股相对强势，A股震荡整理，黄金避险需求犹存。"
         }
     
@@ -545,19 +726,7 @@ class MarketAnalyzer:
         cn: Dict
     ) -> Dict[str, Any]:
         """生成跨市场对比"""
-        return {
-            "performance_ranking": ["美股", "A股", "黄金"],
-            "correlation_notes": [
-                "黄金与美股通常呈负相关",
-                "A股受国内政策影响较大",
-                "美股走势受全球资金流向影响"
-            ],
-            "allocation_suggestion": {
-                "conservative": "60% 美股 + 30% 黄金 + 10% A股",
-                "balanced": "50% 美股 + 25% A股 + 25% 黄金",
-                "aggressive": "60% A股 + 30% 美股 + 10% 黄金"
-            }
-        }
+        return _CROSS_MARKET_COMPARISON
     
     def _generate_key_insights(
         self, 
@@ -566,18 +735,18 @@ class MarketAnalyzer:
         cn: Dict
     ) -> List[str]:
         """生成关键洞察"""
-        insights = []
-        
         # 基于分析生成洞察
-        us_trend = us.get("market_overview", {}).get("status", "")
-        cn_trend = cn.get("market_overview", {}).get("status", "")
+        us_trend = _dig(us, "market_overview.status", "")
+        cn_trend = _dig(cn, "market_overview.status", "")
         gold_trend = gold.get("trend", "")
-        
-        insights.append(f"美股市场{us_trend}，投资者情绪{sentiment}")
-        insights.append(f"A股市场{cn_trend}，关注资金流向变化")
-        insights.append(f"黄金市场呈{gold_trend}，避险需求{sentiment}")
-        
-        return insights
+        us_sent = _dig(us, "market_sentiment.overall", "中性")
+        gold_sent = _dig(gold, "sentiment.overall", "中性")
+
+        return [
+            f"美股市场{us_trend}，投资者情绪{us_sent}",
+            f"A股市场{cn_trend}，关注资金流向变化",
+            f"黄金市场呈{gold_trend}，避险需求{gold_sent}"
+        ]
     
     def _assess_global_risk(
         self, 
@@ -586,21 +755,7 @@ class MarketAnalyzer:
         cn: Dict
     ) -> Dict[str, Any]:
         """评估全球风险"""
-        return {
-            "overall_risk_level": "中等",
-            "risk_factors": [
-                "货币政策不确定性",
-                "地缘政治紧张",
-                "通胀预期波动",
-                "企业盈利压力"
-            ],
-            "mitigation_suggestions": [
-                "分散投资于不同资产类别",
-                "保持适当现金仓位",
-                "关注基本面优质的标的",
-                "设置合理的止损位"
-            ]
-        }
+        return _GLOBAL_RISK
 
 
 def main():
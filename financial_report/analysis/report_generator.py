@@ -7,6 +7,7 @@ Report Generator Module
 """
 
 import os
+import shutil
 import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
@@ -25,12 +26,93 @@ except ImportError:
     config = DefaultConfig()
 
 
+def _dig(d, *keys, default=None):
+    """沿多层键下钻取值，任一层缺失或非dict时返回default"""
+    for key in keys:
+        d = d.get(key) if isinstance(d, dict) else None
+        if d is None:
+            return default
+    return d
+
+
+def _fmt_num(v, spec=".2f", fallback="N/A"):
+    """数值按spec格式化；缺失或非数值返回fallback，
+    避免'N/A'碰上:.2f时的TypeError"""
+    return format(v, spec) if isinstance(v, (int, float)) else fallback
+
+
+# f-string表达式内不能写反斜杠，用常量代替逐次调用chr(10)
+_NL = "\n"
+
+# 报告骨架中完全静态的段落，导入期构造一次，逐次生成时直接复用
+# （等价于模板引擎"编译一次、渲染多次"，但不引入jinja2依赖）
+_REPORT_TOC = """---
+
+## 📋 目录
+
+- [📈 全球市场概览](#-全球市场概览)
+- [🥇 黄金市场分析](#-黄金市场分析)
+- [🇺🇸 美股市场分析](#-美股市场分析)
+- [🇨🇳 A股市场分析](#-a股市场分析)
+- [🔄 跨市场对比](#-跨市场对比)
+- [💡 关键洞察](#-关键洞察)
+- [⚠️ 风险提示](#-风险提示)
+
+---
+
+"""
+
+# 报告目录进程内只创建一次，后续save_report不再重复stat/mkdir
+_DIRS_READY = False
+
+
+def _ensure_reports_dir(reports_dir: Path):
+    """首次保存时惰性创建报告目录"""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
+
+
+_REPORT_FOOTER = """
+---
+
+## 🔗 相关链接
+
+- [黄金价格 - Yahoo Finance](https://finance.yahoo.com/quote/GOLD/)
+- [美股行情 - Yahoo Finance](https://finance.yahoo.com/)
+- [A股行情 - 东方财富](http://www.eastmoney.com/)
+- [本项目GitHub仓库](https://github.com/WolfMoss/AI-Maintained-Repository)
+
+---
+
+> **免责声明**: 本报告仅供投资参考，不构成任何投资建议。投资者应独立判断，自行承担投资风险。
+> 
+> **报告生成**: 🤖 AI自动生成，由Claude AI提供分析支持
+> 
+> **下次更新**: 明天上午 9:00 (UTC+8)
+
+---
+
+<div align="center">
+
+**📊 感谢关注每日金融分析报告**
+
+**🥷 由 WolfMoss 的AI助手精心制作**  
+**🤖 本报告由AI自动更新和维护**
+
+⭐ 如果对您有帮助，欢迎Fork本项目！
+
+</div>
+"""
+
+
 class ReportGenerator:
     """报告生成器"""
     
     def __init__(self):
         self.reports_dir = config.REPORTS_DIR
-        self.reports_dir.mkdir(parents=True, exist_ok=True)
         self.report_config = getattr(config, 'REPORT', {})
     
     def generate_daily_report(
@@ -52,31 +134,44 @@ class ReportGenerator:
         Returns:
             Markdown格式的报告内容
         """
-        current_time = datetime.now()
-        date_str = current_time.strftime("%Y年%m月%d日")
-        timestamp = current_time.strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        report = f"""# 📊 每日金融分析报告
+        # 各分区先解构成局部变量：同一路径只遍历一次，
+        # 不再在f-string里逐格.get(..., {})分配临时空字典
+        gm = analysis.get('gold_market') or {}
+        gold_change = gm.get('change_percent')
+        gold_change_str = 'N/A' if gold_change is None else f"{gold_change:+.2f}%"
+        gm_tech = gm.get('technical_indicators') or {}
+        rsi = gm_tech.get('rsi') or {}
+        macd = gm_tech.get('macd') or {}
+        boll = gm_tech.get('bollinger_bands') or {}
+        gm_fund = gm.get('fundamental_factors') or {}
+        gm_rec = gm.get('recommendation') or {}
+        us = analysis.get('us_market') or {}
+        vix = _dig(us, 'market_sentiment', 'vix') or {}
+        fear_greed = _dig(us, 'market_sentiment', 'fear_greed') or {}
+        us_over = us.get('market_overview') or {}
+        breadth = us_over.get('breadth') or {}
+        us_rec = us.get('recommendation') or {}
+        cn = analysis.get('cn_market') or {}
+        cn_sector = cn.get('sector_performance') or {}
+        cn_rec = cn.get('recommendation') or {}
+        cross = analysis.get('cross_market_comparison') or {}
+        alloc = cross.get('allocation_suggestion') or {}
+        corr_notes = cross.get('correlation_notes') or []
+        risk_assess = analysis.get('risk_assessment') or {}
+        cn_sent = cn_stocks_data.get('sentiment') or {}
+        north = _dig(cn_sent, 'main_inflow', 'north_money') or {}
+        south = _dig(cn_sent, 'main_inflow', 'south_money') or {}
+        turnover = cn_sent.get('turnover_rate') or {}
+        
+        parts = [f"""# 📊 每日金融分析报告
 
 > **报告生成时间**: {timestamp}  
 > **分析周期**: 每日定时更新  
 > **覆盖市场**: 黄金、美股、A股  
 
----
-
-## 📋 目录
-
-- [📈 全球市场概览](#-全球市场概览)
-- [🥇 黄金市场分析](#-黄金市场分析)
-- [🇺🇸 美股市场分析](#-美股市场分析)
-- [🇨🇳 A股市场分析](#-a股市场分析)
-- [🔄 跨市场对比](#-跨市场对比)
-- [💡 关键洞察](#-关键洞察)
-- [⚠️ 风险提示](#-风险提示)
-
----
-
-## 📈 全球市场概览
+""", _REPORT_TOC, f"""## 📈 全球市场概览
 
 ### 整体状态
 
@@ -86,9 +181,9 @@ class ReportGenerator:
 
 | 市场 | 情绪指标 | 状态 |
 |------|---------|------|
-| 美股 | VIX指数 {analysis.get('us_market', {}).get('market_sentiment', {}).get('vix', {}).get('value', 'N/A')} | {'偏乐观' if analysis.get('us_market', {}).get('market_sentiment', {}).get('fear_greed', {}).get('value', 50) > 50 else '偏谨慎'} |
-| A股 | 北向资金 {cn_stocks_data.get('sentiment', {}).get('main_inflow', {}).get('north_money', {}).get('interpretation', 'N/A')} | 净流入 |
-| 黄金 | 市场情绪 {analysis.get('gold_market', {}).get('sentiment', {}).get('overall', 'N/A')} | 中性 |
+| 美股 | VIX指数 {vix.get('value', 'N/A')} | {'偏乐观' if fear_greed.get('value', 50) > 50 else '偏谨慎'} |
+| A股 | 北向资金 {north.get('interpretation', 'N/A')} | 净流入 |
+| 黄金 | 市场情绪 {gm.get('sentiment', {}).get('overall', 'N/A')} | 中性 |
 
 ---
 
@@ -98,39 +193,39 @@ class ReportGenerator:
 
 | 指标 | 数值 | 涨跌 |
 |------|------|------|
-| 当前价格 | {analysis.get('gold_market', {}).get('current_price', 'N/A'):.2f} USD | {'N/A' if analysis.get('gold_market', {}).get('change_percent') is None else f"{analysis.get('gold_market', {}).get('change_percent'):+.2f}%"} |
-| 走势判断 | {analysis.get('gold_market', {}).get('trend', 'N/A')} | - |
-| 支撑位 | {', '.join([str(s) for s in analysis.get('gold_market', {}).get('support_levels', [])])} USD | - |
-| 阻力位 | {', '.join([str(r) for r in analysis.get('gold_market', {}).get('resistance_levels', [])])} USD | - |
+| 当前价格 | {_fmt_num(gm.get('current_price'))} USD | {gold_change_str} |
+| 走势判断 | {gm.get('trend', 'N/A')} | - |
+| 支撑位 | {', '.join([str(s) for s in gm.get('support_levels', [])])} USD | - |
+| 阻力位 | {', '.join([str(r) for r in gm.get('resistance_levels', [])])} USD | - |
 
 ### 技术分析
 
 | 指标 | 数值 | 解读 |
 |------|------|------|
-| RSI(14) | {analysis.get('gold_market', {}).get('technical_indicators', {}).get('rsi', {}).get('value', 'N/A')} | {analysis.get('gold_market', {}).get('technical_indicators', {}).get('rsi', {}).get('interpretation', '')} |
-| MACD | {analysis.get('gold_market', {}).get('technical_indicators', {}).get('macd', {}).get('value', 'N/A')} | {analysis.get('gold_market', {}).get('technical_indicators', {}).get('macd', {}).get('interpretation', '')} |
-| 布林带 | {analysis.get('gold_market', {}).get('technical_indicators', {}).get('bollinger_bands', {}).get('position', 'N/A')} | {analysis.get('gold_market', {}).get('technical_indicators', {}).get('bollinger_bands', {}).get('interpretation', '')} |
+| RSI(14) | {rsi.get('value', 'N/A')} | {rsi.get('interpretation', '')} |
+| MACD | {macd.get('value', 'N/A')} | {macd.get('interpretation', '')} |
+| 布林带 | {boll.get('position', 'N/A')} | {boll.get('interpretation', '')} |
 
 ### 基本面因素
 
 | 因素 | 状态 | 影响 |
 |------|------|------|
-| 通胀对冲 | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('inflation_hedge', {}).get('status', 'N/A')} | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('inflation_hedge', {}).get('impact', 'N/A')} |
-| 美元走势 | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('usd_strength', {}).get('status', 'N/A')} | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('usd_strength', {}).get('impact', 'N/A')} |
-| 地缘政治 | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('geopolitical', {}).get('status', 'N/A')} | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('geopolitical', {}).get('impact', 'N/A')} |
-| 央行购金 | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('central_bank', {}).get('status', 'N/A')} | {analysis.get('gold_market', {}).get('fundamental_factors', {}).get('central_bank', {}).get('impact', 'N/A')} |
+| 通胀对冲 | {gm_fund.get('inflation_hedge', {}).get('status', 'N/A')} | {gm_fund.get('inflation_hedge', {}).get('impact', 'N/A')} |
+| 美元走势 | {gm_fund.get('usd_strength', {}).get('status', 'N/A')} | {gm_fund.get('usd_strength', {}).get('impact', 'N/A')} |
+| 地缘政治 | {gm_fund.get('geopolitical', {}).get('status', 'N/A')} | {gm_fund.get('geopolitical', {}).get('impact', 'N/A')} |
+| 央行购金 | {gm_fund.get('central_bank', {}).get('status', 'N/A')} | {gm_fund.get('central_bank', {}).get('impact', 'N/A')} |
 
 ### 市场展望
 
-> 💡 **AI分析**: {analysis.get('gold_market', {}).get('outlook', '数据不足')}
+> 💡 **AI分析**: {gm.get('outlook', '数据不足')}
 
 ### 投资建议
 
 | 建议 | 详情 |
 |------|------|
-| 操作建议 | {analysis.get('gold_market', {}).get('recommendation', {}).get('action', 'N/A')} |
-| 原因 | {analysis.get('gold_market', {}).get('recommendation', {}).get('reason', 'N/A')} |
-| 风险等级 | {analysis.get('gold_market', {}).get('recommendation', {}).get('risk_level', 'N/A')} |
+| 操作建议 | {gm_rec.get('action', 'N/A')} |
+| 原因 | {gm_rec.get('reason', 'N/A')} |
+| 风险等级 | {gm_rec.get('risk_level', 'N/A')} |
 
 ---
 
@@ -140,56 +235,58 @@ class ReportGenerator:
 
 | 指数 | 最新点位 | 涨跌幅 | 状态 |
 |------|---------|--------|------|
-"""
-
-        # 添加美股指数数据
-        us_indices = analysis.get('us_market', {}).get('index_analysis', {})
-        for symbol, data in us_indices.items():
-            report += f"| {data.get('name', symbol)} | {data.get('close', 'N/A'):,.2f} | {data.get('change_percent', 0):+.2f}% | {data.get('trend', 'N/A')} |\n"
+"""]
+
+        # 添加美股指数数据：整张表一次join成串，循环里不再逐行append
+        us_indices = us.get('index_analysis', {})
+        parts.append("".join(
+            f"| {data.get('name', symbol)} | {_fmt_num(data.get('close'), ',.2f')} | {_fmt_num(data.get('change_percent', 0), '+.2f')}% | {data.get('trend', 'N/A')} |\n"
+            for symbol, data in us_indices.items()
+        ))
         
-        report += f"""
+        parts.append(f"""
 ### 市场情绪
 
 | 指标 | 数值 | 解读 |
 |------|------|------|
-| VIX恐慌指数 | {analysis.get('us_market', {}).get('market_sentiment', {}).get('vix', {}).get('value', 'N/A')} | {analysis.get('us_market', {}).get('market_sentiment', {}).get('vix', {}).get('interpretation', 'N/A')} |
-| 恐惧贪婪指数 | {analysis.get('us_market', {}).get('market_sentiment', {}).get('fear_greed', {}).get('value', 'N/A')} ({analysis.get('us_market', {}).get('market_sentiment', {}).get('fear_greed', {}).get('level', 'N/A')}) | {analysis.get('us_market', {}).get('market_sentiment', {}).get('fear_greed', {}).get('interpretation', 'N/A')} |
+| VIX恐慌指数 | {vix.get('value', 'N/A')} | {vix.get('interpretation', 'N/A')} |
+| 恐惧贪婪指数 | {fear_greed.get('value', 'N/A')} ({fear_greed.get('level', 'N/A')}) | {fear_greed.get('interpretation', 'N/A')} |
 
 ### 板块表现
 
-- **领涨板块**: {', '.join(analysis.get('us_market', {}).get('market_overview', {}).get('leading_sectors', ['数据不足']))}
-- **领跌板块**: {', '.join(analysis.get('us_market', {}).get('market_overview', {}).get('lagging_sectors', ['数据不足']))}
+- **领涨板块**: {', '.join(us_over.get('leading_sectors', ['数据不足']))}
+- **领跌板块**: {', '.join(us_over.get('lagging_sectors', ['数据不足']))}
 
 ### 市场广度
 
 | 指标 | 数值 |
 |------|------|
-| 上涨家数 | {analysis.get('us_market', {}).get('market_overview', {}).get('breadth', {}).get('advance', 0)} |
-| 下跌家数 | {analysis.get('us_market', {}).get('market_overview', {}).get('breadth', {}).get('decline', 0)} |
-| 市场广度 | {analysis.get('us_market', {}).get('market_overview', {}).get('breadth', {}).get('breadth', 'N/A')} |
+| 上涨家数 | {breadth.get('advance', 0)} |
+| 下跌家数 | {breadth.get('decline', 0)} |
+| 市场广度 | {breadth.get('breadth', 'N/A')} |
 
 ### 重要经济事件
 
 | 事件 | 日期 | 影响 | 预测 |
 |------|------|------|------|
-"""
+""")
         
         # 添加经济事件
-        for event in analysis.get('us_market', {}).get('economic_events', [])[:3]:
-            report += f"| {event.get('event', 'N/A')} | {event.get('date', 'N/A')} | {event.get('impact', 'N/A')} | {event.get('forecast', 'N/A')} |\n"
+        for event in us.get('economic_events', [])[:3]:
+            parts.append(f"| {event.get('event', 'N/A')} | {event.get('date', 'N/A')} | {event.get('impact', 'N/A')} | {event.get('forecast', 'N/A')} |\n")
         
-        report += f"""
+        parts.append(f"""
 ### 市场展望
 
-> 💡 **AI分析**: {analysis.get('us_market', {}).get('outlook', '数据不足')}
+> 💡 **AI分析**: {us.get('outlook', '数据不足')}
 
 ### 投资建议
 
 | 建议 | 详情 |
 |------|------|
-| 操作建议 | {analysis.get('us_market', {}).get('recommendation', {}).get('action', 'N/A')} |
-| 原因 | {analysis.get('us_market', {}).get('recommendation', {}).get('reason', 'N/A')} |
-| 风险等级 | {analysis.get('us_market', {}).get('recommendation', {}).get('risk_level', 'N/A')} |
+| 操作建议 | {us_rec.get('action', 'N/A')} |
+| 原因 | {us_rec.get('reason', 'N/A')} |
+| 风险等级 | {us_rec.get('risk_level', 'N/A')} |
 
 ---
 
@@ -199,55 +296,57 @@ class ReportGenerator:
 
 | 指数 | 最新点位 | 涨跌幅 | 状态 |
 |------|---------|--------|------|
-"""
-
-        # 添加A股指数数据
-        cn_indices = analysis.get('cn_market', {}).get('index_analysis', {})
-        for symbol, data in cn_indices.items():
-            report += f"| {data.get('name', symbol)} | {data.get('close', 'N/A'):,.2f} | {data.get('change_percent', 0):+.2f}% | {data.get('trend', 'N/A')} |\n"
+""")
+
+        # 添加A股指数数据：同美股，单次join生成全部行
+        cn_indices = cn.get('index_analysis', {})
+        parts.append("".join(
+            f"| {data.get('name', symbol)} | {_fmt_num(data.get('close'), ',.2f')} | {_fmt_num(data.get('change_percent', 0), '+.2f')}% | {data.get('trend', 'N/A')} |\n"
+            for symbol, data in cn_indices.items()
+        ))
         
-        report += f"""
+        parts.append(f"""
 ### 资金流向
 
 | 流向 | 金额 | 状态 |
 |------|------|------|
-| 北向资金 | {cn_stocks_data.get('sentiment', {}).get('main_inflow', {}).get('north_money', {}).get('value', 0) / 100000000:.1f}亿元 | {cn_stocks_data.get('sentiment', {}).get('main_inflow', {}).get('north_money', {}).get('interpretation', 'N/A')} |
-| 南向资金 | {cn_stocks_data.get('sentiment', {}).get('main_inflow', {}).get('south_money', {}).get('value', 0) / 100000000:.1f}亿元 | {cn_stocks_data.get('sentiment', {}).get('main_inflow', {}).get('south_money', {}).get('interpretation', 'N/A')} |
+| 北向资金 | {north.get('value', 0) / 100000000:.1f}亿元 | {north.get('interpretation', 'N/A')} |
+| 南向资金 | {south.get('value', 0) / 100000000:.1f}亿元 | {south.get('interpretation', 'N/A')} |
 
 ### 市场换手率
 
 | 市场 | 换手率 | 状态 |
 |------|--------|------|
-| 上海 | {cn_stocks_data.get('sentiment', {}).get('turnover_rate', {}).get('shanghai', 0):.2f}% | {'活跃' if cn_stocks_data.get('sentiment', {}).get('turnover_rate', {}).get('shanghai', 0) > 1 else '一般'} |
-| 深圳 | {cn_stocks_data.get('sentiment', {}).get('turnover_rate', {}).get('shenzhen', 0):.2f}% | {'活跃' if cn_stocks_data.get('sentiment', {}).get('turnover_rate', {}).get('shenzhen', 0) > 1.5 else '一般'} |
+| 上海 | {turnover.get('shanghai', 0):.2f}% | {'活跃' if turnover.get('shanghai', 0) > 1 else '一般'} |
+| 深圳 | {turnover.get('shenzhen', 0):.2f}% | {'活跃' if turnover.get('shenzhen', 0) > 1.5 else '一般'} |
 
 ### 板块表现
 
 | 类型 | 板块 |
 |------|------|
-| 表现强势 | {', '.join(analysis.get('cn_market', {}).get('sector_performance', {}).get('表现强势', ['数据不足']))} |
-| 表现弱势 | {', '.join(analysis.get('cn_market', {}).get('sector_performance', {}).get('表现弱势', ['数据不足']))} |
+| 表现强势 | {', '.join(cn_sector.get('表现强势', ['数据不足']))} |
+| 表现弱势 | {', '.join(cn_sector.get('表现弱势', ['数据不足']))} |
 
 ### 政策要闻
 
-"""
+""")
         
         # 添加政策新闻
         for news in cn_stocks_data.get('policy_news', [])[:2]:
-            report += f"**{news.get('title', 'N/A')}** ({news.get('date', 'N/A')})\n- 来源: {news.get('source', 'N/A')}\n- 摘要: {news.get('summary', 'N/A')}\n\n"
+            parts.append(f"**{news.get('title', 'N/A')}** ({news.get('date', 'N/A')})\n- 来源: {news.get('source', 'N/A')}\n- 摘要: {news.get('summary', 'N/A')}\n\n")
         
-        report += f"""
+        parts.append(f"""
 ### 市场展望
 
-> 💡 **AI分析**: {analysis.get('cn_market', {}).get('outlook', '数据不足')}
+> 💡 **AI分析**: {cn.get('outlook', '数据不足')}
 
 ### 投资建议
 
 | 建议 | 详情 |
 |------|------|
-| 操作建议 | {analysis.get('cn_market', {}).get('recommendation', {}).get('action', 'N/A')} |
-| 原因 | {analysis.get('cn_market', {}).get('recommendation', {}).get('reason', 'N/A')} |
-| 风险等级 | {analysis.get('cn_market', {}).get('recommendation', {}).get('risk_level', 'N/A')} |
+| 操作建议 | {cn_rec.get('action', 'N/A')} |
+| 原因 | {cn_rec.get('reason', 'N/A')} |
+| 风险等级 | {cn_rec.get('risk_level', 'N/A')} |
 
 ---
 
@@ -255,32 +354,32 @@ class ReportGenerator:
 
 ### 表现排名
 
-{', '.join(analysis.get('cross_market_comparison', {}).get('performance_ranking', ['数据不足']))}
+{', '.join(cross.get('performance_ranking', ['数据不足']))}
 
 ### 资产配置建议
 
 | 策略类型 | 配置方案 |
 |----------|----------|
-| 保守型 | {analysis.get('cross_market_comparison', {}).get('allocation_suggestion', {}).get('conservative', 'N/A')} |
-| 平衡型 | {analysis.get('cross_market_comparison', {}).get('allocation_suggestion', {}).get('balanced', 'N/A')} |
-| 进取型 | {analysis.get('cross_market_comparison', {}).get('allocation_suggestion', {}).get('aggressive', 'N/A')} |
+| 保守型 | {alloc.get('conservative', 'N/A')} |
+| 平衡型 | {alloc.get('balanced', 'N/A')} |
+| 进取型 | {alloc.get('aggressive', 'N/A')} |
 
 ### 相关性说明
 
-- {analysis.get('cross_market_comparison', {}).get('correlation_notes', ['数据不足'])[0] if analysis.get('cross_market_comparison', {}).get('correlation_notes') else '数据不足'}
-- {analysis.get('cross_market_comparison', {}).get('correlation_notes', ['数据不足'])[1] if analysis.get('cross_market_comparison', {}).get('correlation_notes') and len(analysis.get('cross_market_comparison', {}).get('correlation_notes', [])) > 1 else ''}
+- {corr_notes[0] if corr_notes else '数据不足'}
+- {corr_notes[1] if len(corr_notes) > 1 else ''}
 
 ---
 
 ## 💡 关键洞察
 
-"""
+""")
 
         # 添加关键洞察
         for i, insight in enumerate(analysis.get('key_insights', []), 1):
-            report += f"{i}. {insight}\n"
+            parts.append(f"{i}. {insight}\n")
         
-        report += f"""
+        parts.append(f"""
 
 ---
 
@@ -290,26 +389,26 @@ class ReportGenerator:
 
 | 风险因素 | 说明 |
 |----------|------|
-| 整体风险 | {analysis.get('risk_assessment', {}).get('overall_risk_level', 'N/A')} |
+| 整体风险 | {risk_assess.get('overall_risk_level', 'N/A')} |
 
 ### 主要风险因素
 
-"""
+""")
         
         # 添加风险因素
-        for risk in analysis.get('risk_assessment', {}).get('risk_factors', []):
-            report += f"- {risk}\n"
+        for risk in risk_assess.get('risk_factors', []):
+            parts.append(f"- {risk}\n")
         
-        report += f"""
+        parts.append(f"""
 ### 风险应对建议
 
-"""
+""")
 
         # 添加应对建议
-        for suggestion in analysis.get('risk_assessment', {}).get('mitigation_suggestions', []):
-            report += f"- {suggestion}\n"
+        for suggestion in risk_assess.get('mitigation_suggestions', []):
+            parts.append(f"- {suggestion}\n")
         
-        report += f"""
+        parts.append(f"""
 ---
 
 ## 📝 数据来源
@@ -319,39 +418,10 @@ class ReportGenerator:
 | 黄金 | Yahoo Finance, Kitco | {gold_data.get('collection_time', 'N/A')} |
 | 美股 | Yahoo Finance, Alpha Vantage | {us_stocks_data.get('collection_time', 'N/A')} |
 | A股 | 东方财富, 新浪财经 | {cn_stocks_data.get('collection_time', 'N/A')} |
-
----
-
-## 🔗 相关链接
-
-- [黄金价格 - Yahoo Finance](https://finance.yahoo.com/quote/GOLD/)
-- [美股行情 - Yahoo Finance](https://finance.yahoo.com/)
-- [A股行情 - 东方财富](http://www.eastmoney.com/)
-- [本项目GitHub仓库](https://github.com/WolfMoss/AI-Maintained-Repository)
-
----
-
-> **免责声明**: 本报告仅供投资参考，不构成任何投资建议。投资者应独立判断，自行承担投资风险。
-> 
-> **报告生成**: 🤖 AI自动生成，由Claude AI提供分析支持
-> 
-> **下次更新**: 明天上午 9:00 (UTC+8)
-
----
-
-<div align="center">
-
-**📊 感谢关注每日金融分析报告**
-
-**🥷 由 WolfMoss 的AI助手精心制作**  
-**🤖 本报告由AI自动更新和维护**
-
-⭐ 如果对您有帮助，欢迎Fork本项目！
-
-</div>
-"""
+""")
+        parts.append(_REPORT_FOOTER)
         
-        return report
+        return "".join(parts)
     
     def _format_global_overview(self, overview: Dict) -> str:
         """格式化全球概览"""
@@ -362,7 +432,7 @@ class ReportGenerator:
 **整体状态**: {overview.get('overall_status', '数据不足')}
 
 **主要驱动力**:
-{chr(10).join(['- ' + driver for driver in overview.get('key_drivers', [])])}
+{_NL.join('- ' + driver for driver in overview.get('key_drivers', []))}
 
 **综合评价**: {overview.get('summary', '数据不足')}
 """
@@ -382,17 +452,22 @@ class ReportGenerator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"financial_report_{timestamp}.md"
         
+        _ensure_reports_dir(self.reports_dir)
         filepath = self.reports_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # 整份内容编码一次、一次write落盘，绕开TextIOWrapper的分块增量编码
+        filepath.write_bytes(content.encode("utf-8"))
         
         print(f"💾 报告已保存: {filepath}")
         
-        # 更新最新报告链接
+        # 更新最新报告链接：改写相对符号链接，不再把全文二次落盘
         latest_link = self.reports_dir / "latest_report.md"
-        with open(latest_link, 'w', encoding='utf-8') as f:
-            f.write(content)
+        try:
+            latest_link.unlink(missing_ok=True)
+            latest_link.symlink_to(filepath.name)
+        except OSError:
+            # 个别平台不允许建符号链接（如无特权的Windows），退回文件复制
+            shutil.copyfile(filepath, latest_link)
         
         return str(filepath)
     
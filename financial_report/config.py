@@ -6,11 +6,16 @@ Financial Analysis Report Generator - Configuration
 此文件由AI自动维护和更新
 """
 
+import functools
 import os
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
 
+# 时间格式串提为常量，strftime不必每次调用重新读字面量
+_REPORT_FILENAME_TIME_FORMAT = "%Y%m%d_%H%M%S"
+_COMMIT_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
 
 class FinancialReportConfig:
     """金融分析报告配置类"""
@@ -148,25 +153,33 @@ class FinancialReportConfig:
         }
     }
     
+    # 目录创建进程内只执行一次的哨兵
+    _directories_ready = False
+
     def __init__(self):
         """初始化配置"""
         self._ensure_directories()
         self._load_api_keys()
-    
-    def _ensure_directories(self):
-        """确保必要的目录存在"""
+
+    @classmethod
+    def _ensure_directories(cls):
+        """确保必要的目录存在（进程内只执行一次，重复实例化不再发stat/mkdir）"""
+        if cls._directories_ready:
+            return
         directories = [
-            self.DATA_DIR / "gold",
-            self.DATA_DIR / "stocks_usa",
-            self.DATA_DIR / "stocks_cn",
-            self.ANALYSIS_DIR,
-            self.REPORTS_DIR,
-            self.INTEGRATIONS_DIR,
-            self.PROJECT_ROOT / "logs"
+            cls.DATA_DIR / "gold",
+            cls.DATA_DIR / "stocks_usa",
+            cls.DATA_DIR / "stocks_cn",
+            cls.ANALYSIS_DIR,
+            cls.REPORTS_DIR,
+            cls.INTEGRATIONS_DIR,
+            cls.PROJECT_ROOT / "logs"
         ]
-        
+
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
+
+        cls._directories_ready = True
     
     def _load_api_keys(self):
         """加载API密钥"""
@@ -178,28 +191,33 @@ class FinancialReportConfig:
             "anthropic": os.getenv("ANTHROPIC_API_KEY", "")
         }
     
-    def get_market_config(self, market: str) -> Dict[str, Any]:
-        """获取特定市场的配置"""
-        return self.MARKETS.get(market, {})
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_market_config(cls, market: str) -> Dict[str, Any]:
+        """获取特定市场的配置（按市场名缓存，MARKETS为静态配置）"""
+        return cls.MARKETS.get(market, {})
     
-    def is_market_enabled(self, market: str) -> bool:
+    @classmethod
+    def is_market_enabled(cls, market: str) -> bool:
         """检查市场是否启用"""
-        config = self.get_market_config(market)
+        config = cls.get_market_config(market)
         return config.get("enabled", False)
     
-    def get_enabled_markets(self) -> List[str]:
-        """获取所有已启用的市场"""
-        return [market for market in self.MARKETS if self.is_market_enabled(market)]
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_enabled_markets(cls) -> List[str]:
+        """获取所有已启用的市场（结果缓存，调度循环反复调用时不再重算）"""
+        return [market for market in cls.MARKETS if cls.is_market_enabled(market)]
     
     def get_report_filename(self) -> str:
-        """生成报告文件名"""
+        """生成报告文件名（时间戳逐次变化，不做缓存）"""
         now = datetime.now()
-        return f"financial_report_{now.strftime('%Y%m%d_%H%M%S')}.md"
+        return f"financial_report_{now.strftime(_REPORT_FILENAME_TIME_FORMAT)}.md"
     
     def get_commit_message(self) -> str:
         """生成提交信息"""
         now = datetime.now()
-        date_str = now.strftime("%Y-%m-%d %H:%M")
+        date_str = now.strftime(_COMMIT_TIME_FORMAT)
         return self.GIT_COMMIT["commit_message_template"].format(date=date_str)
 
 